@@ -0,0 +1,393 @@
+import json
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+# Berita dihitung untuk siaran pers kalau terbit paling lama sekian hari setelahnya
+DEFAULT_WINDOW_DAYS = 7
+
+
+def filter_sp(sp_df, start_date, end_date, titles=None):
+    """
+    Siaran pers dengan tanggal PUBLIKASI di [start_date, end_date] (inklusif,
+    per hari), opsional dibatasi ke judul tertentu
+    """
+    publikasi = sp_df['PUBLIKASI']
+    start = pd.Timestamp(start_date)
+    end = pd.Timestamp(end_date) + pd.Timedelta(days=1)
+    filtered = sp_df[(publikasi >= start) & (publikasi < end)]
+    if titles:
+        filtered = filtered[filtered['JUDUL'].isin(titles)]
+    return filtered
+
+
+def match_berita_to_sp(berita_df, sp_df, window_days=DEFAULT_WINDOW_DAYS):
+    """
+    Join berita dengan siaran pers secara set-based (pengganti loop iterrows):
+    equi-join pada judul ('Siaran Pers' == 'JUDUL') lalu kondisi jendela
+    tanggal PUBLIKASI <= Tanggal <= PUBLIKASI + window_days.
+
+    Mengembalikan DataFrame pasangan dengan kolom:
+    - sp_pos: posisi baris di sp_df
+    - berita_pos: posisi baris di berita_df
+    - delta: selisih Tanggal - PUBLIKASI
+    """
+    sp = pd.DataFrame({
+        'title': sp_df['JUDUL'].astype(object).to_numpy(),
+        'publikasi': sp_df['PUBLIKASI'].to_numpy(),
+        'sp_pos': np.arange(len(sp_df)),
+    }).dropna(subset=['title', 'publikasi'])
+
+    berita = pd.DataFrame({
+        'title': berita_df['Siaran Pers'].astype(object).to_numpy(),
+        'tanggal': berita_df['Tanggal'].to_numpy(),
+        'berita_pos': np.arange(len(berita_df)),
+    }).dropna(subset=['title', 'tanggal'])
+
+    # Hash join pada judul; ukuran hasil sebanding dengan jumlah berita per judul
+    pairs = sp.merge(berita, on='title', how='inner', sort=False)
+    delta = pairs['tanggal'] - pairs['publikasi']
+    in_window = (delta >= pd.Timedelta(0)) & (delta <= pd.Timedelta(days=window_days))
+
+    return pd.DataFrame({
+        'sp_pos': pairs['sp_pos'].to_numpy()[in_window.to_numpy()],
+        'berita_pos': pairs['berita_pos'].to_numpy()[in_window.to_numpy()],
+        'delta': delta[in_window].to_numpy(),
+    })
+
+
+def filter_berita_positions(berita_df, sp_df, window_days=DEFAULT_WINDOW_DAYS):
+    """
+    Posisi (urut naik) baris berita_df yang masuk jendela salah satu siaran pers
+    di sp_df, tanpa duplikat
+    """
+    pairs = match_berita_to_sp(berita_df, sp_df, window_days)
+    return np.unique(pairs['berita_pos'].to_numpy())
+
+
+# Jendela (hari) yang dibandingkan di analisis jangkauan siaran pers
+COVERAGE_WINDOWS = (1, 3, 7, 14, 30)
+
+
+def coverage_by_window(berita_df, sp_df, windows=COVERAGE_WINDOWS):
+    """
+    Jangkauan tiap siaran pers untuk beberapa jendela sekaligus, dalam satu
+    pass: join dilakukan sekali dengan jendela terbesar, lalu tiap jendela
+    cukup dihitung dari selisih hari pasangan yang sudah ada.
+
+    Mengembalikan satu baris per siaran pers yang punya PUBLIKASI (urutan
+    mengikuti sp_df) dengan kolom Tanggal_SP, Judul_SP, lalu Berita_<w> (jumlah
+    artikel) dan Media_<w> (jumlah media unik) untuk setiap jendela w.
+    """
+    windows = sorted(windows)
+    pairs = match_berita_to_sp(berita_df, sp_df, windows[-1])
+
+    sp_pos = pairs['sp_pos'].to_numpy()
+    delta = pairs['delta'].to_numpy()
+    n_sp = len(sp_df)
+
+    # Untuk media unik: selisih terkecil per (siaran pers, media)
+    media_codes, _ = pd.factorize(berita_df['Sumber Media'].to_numpy())
+    first_media = pd.DataFrame({
+        'sp_pos': sp_pos,
+        'media': media_codes[pairs['berita_pos'].to_numpy()],
+        'delta': delta,
+    })
+    first_media = first_media[first_media['media'] >= 0].groupby(['sp_pos', 'media'])['delta'].min()
+    media_sp_pos = first_media.index.get_level_values('sp_pos').to_numpy()
+    media_delta = first_media.to_numpy()
+
+    result = pd.DataFrame({
+        'Tanggal_SP': sp_df['PUBLIKASI'].to_numpy(),
+        'Judul_SP': sp_df['JUDUL'].astype(object).to_numpy(),
+    })
+    for window in windows:
+        limit = np.timedelta64(window, 'D')
+        result[f'Berita_{window}'] = np.bincount(sp_pos[delta <= limit], minlength=n_sp)
+        result[f'Media_{window}'] = np.bincount(media_sp_pos[media_delta <= limit], minlength=n_sp)
+
+    return result[result['Tanggal_SP'].notna()].reset_index(drop=True)
+
+
+def build_daily_cube(berita_df):
+    """
+    Cube agregat berita per versi dataset: satu baris per kombinasi
+    (Tanggal, Siaran Pers, Sumber Media) dengan jumlah artikel di kolom COUNT.
+    Tanggal di sheet berupa hari, jadi ukuran cube mengikuti jumlah kombinasi
+    hari x siaran pers x media, bukan jumlah artikel.
+    Baris tanpa Tanggal atau Siaran Pers tidak pernah cocok dengan siaran pers
+    sehingga tidak ikut; Sumber Media kosong tetap dihitung.
+    """
+    rows = berita_df[['Tanggal', 'Siaran Pers', 'Sumber Media']].dropna(subset=['Tanggal', 'Siaran Pers'])
+    return (rows.groupby(['Tanggal', 'Siaran Pers', 'Sumber Media'], observed=True, dropna=False, sort=False)
+            .size()
+            .reset_index(name='COUNT'))
+
+
+def cube_positions(cube, sp_df, window_days=DEFAULT_WINDOW_DAYS):
+    """
+    Posisi sel cube yang masuk jendela salah satu siaran pers di sp_df. Join
+    jendela sama dengan filter berita; sel yang cocok dengan beberapa siaran
+    pers (jendela tumpang tindih) hanya diambil sekali.
+    """
+    return filter_berita_positions(cube, sp_df, window_days)
+
+
+def slice_cube(cube, sp_df, window_days=DEFAULT_WINDOW_DAYS):
+    """
+    Sel cube untuk siaran pers di sp_df (lihat cube_positions)
+    """
+    return cube.iloc[cube_positions(cube, sp_df, window_days)]
+
+
+def cube_sp_stats(cells):
+    """
+    Per siaran pers dari potongan cube: jumlah artikel (Berita) dan jumlah
+    media unik (Media), urut mengikuti kategori judul
+    """
+    berita = cells.groupby('Siaran Pers', observed=True)['COUNT'].sum()
+    media = (cells.dropna(subset=['Sumber Media'])
+             .drop_duplicates(['Siaran Pers', 'Sumber Media'])
+             .groupby('Siaran Pers', observed=True)
+             .size())
+    return pd.DataFrame({
+        'Berita': berita,
+        'Media': media.reindex(berita.index, fill_value=0),
+    })
+
+
+def cube_media_counts(cells):
+    """
+    Jumlah artikel per media dari potongan cube, terbanyak dulu
+    """
+    counts = cells.groupby('Sumber Media', observed=True)['COUNT'].sum()
+    return counts[counts > 0].sort_values(ascending=False, kind='mergesort')
+
+
+def cube_timeline(cells):
+    """
+    Jumlah artikel per hari dari potongan cube (kolom Tanggal dan COUNT)
+    """
+    return cells.groupby(cells['Tanggal'].dt.date)['COUNT'].sum().reset_index()
+
+
+def clean_narasumber_names(names):
+    """
+    Versi vectorized clean_narasumber_name:
+    - Kalau tidak ada koma, kembalikan nama lengkap
+    - Kalau ada koma, kembalikan bagian setelah koma pertama
+    """
+    names = names.str.strip()
+    after_comma = names.str.split(',').str[1].str.strip()
+    return names.where(~names.str.contains(',', regex=False), after_comma)
+
+
+def build_narasumber_table(sp_df):
+    """
+    Tabel narasumber exploded, dibangun sekali per versi dataset SP: satu baris
+    per (siaran pers, narasumber) dengan kolom SP_ID (label index sp_df),
+    JUDUL, PUBLIKASI, CLEAN_NARASUMBER, Week_start dan Week_end.
+    Filter tanggal/judul cukup memotong tabel ini lewat SP_ID.
+    """
+    exploded = sp_df['NARASUMBER'].fillna('').astype(str).str.split(';').explode()
+    names = clean_narasumber_names(exploded)
+    keep = (names != '').to_numpy()
+
+    sp_ids = exploded.index[keep]
+    table = pd.DataFrame({
+        'SP_ID': sp_ids,
+        'JUDUL': sp_df['JUDUL'].loc[sp_ids].to_numpy(),
+        'PUBLIKASI': sp_df['PUBLIKASI'].loc[sp_ids].to_numpy(),
+        'CLEAN_NARASUMBER': names.to_numpy()[keep],
+    })
+    if isinstance(sp_df['JUDUL'].dtype, pd.CategoricalDtype):
+        table['JUDUL'] = pd.Categorical(table['JUDUL'], dtype=sp_df['JUDUL'].dtype)
+
+    week = table['PUBLIKASI'].dt.to_period('W')
+    table['Week_start'] = week.dt.start_time
+    table['Week_end'] = week.dt.end_time
+    return table
+
+
+def slice_narasumber_table(table, sp_df):
+    """
+    Baris tabel narasumber untuk siaran pers yang ada di sp_df (hasil filter)
+    """
+    return table[table['SP_ID'].isin(sp_df.index)]
+
+
+def narasumber_weekly_counts(table):
+    """
+    Jumlah kemunculan per narasumber per minggu (kolom COUNT)
+    """
+    return table.groupby(['CLEAN_NARASUMBER', 'Week_start', 'Week_end']).size().reset_index(name='COUNT')
+
+
+def build_sankey(df, stages, weight=None):
+    """
+    Data Sankey multi-tahap dari frame "tidy": satu baris per item, satu kolom
+    per tahap (mis. ['Siaran Pers', 'Sumber Media', 'Volume']). Link antara
+    dua tahap berurutan bernilai jumlah baris (atau jumlah kolom weight).
+
+    Node diidentifikasi per (tahap, label) lewat hash index, jadi label yang
+    sama di tahap berbeda tidak bertabrakan. Urutan node stabil: per tahap,
+    dari total aliran terbesar lalu label.
+
+    Mengembalikan dict dengan labels, stages, source, target dan value.
+    """
+    values = df[weight] if weight else pd.Series(1, index=df.index)
+
+    labels = []
+    node_stages = []
+    stage_nodes = {}
+    for stage in stages:
+        totals = values.groupby(df[stage], observed=True, sort=False).sum()
+        totals = totals.sort_index(kind='mergesort').sort_values(ascending=False, kind='mergesort')
+        stage_nodes[stage] = (len(labels), pd.Index(totals.index))
+        labels.extend(totals.index.tolist())
+        node_stages.extend([stage] * len(totals))
+
+    source, target, link_values = [], [], []
+    for left, right in zip(stages, stages[1:]):
+        flows = values.groupby([df[left], df[right]], observed=True, sort=False).sum()
+        flows = flows[flows > 0]
+        left_offset, left_index = stage_nodes[left]
+        right_offset, right_index = stage_nodes[right]
+        source.extend((left_index.get_indexer(flows.index.get_level_values(0)) + left_offset).tolist())
+        target.extend((right_index.get_indexer(flows.index.get_level_values(1)) + right_offset).tolist())
+        link_values.extend(flows.tolist())
+
+    return {
+        'labels': labels,
+        'stages': node_stages,
+        'source': source,
+        'target': target,
+        'value': link_values,
+    }
+
+
+# Kategori volume pemberitaan per media untuk diagram Sankey
+VOLUME_BINS = [0, 2, 5, float('inf')]
+VOLUME_LABELS = ['Low (1-2)', 'Medium (3-5)', 'High (6+)']
+
+
+def volume_category(counts):
+    """
+    Kategori volume (Low/Medium/High) untuk Series jumlah artikel
+    """
+    return pd.cut(counts, bins=VOLUME_BINS, labels=VOLUME_LABELS)
+
+
+def _records(df):
+    # DataFrame -> list of dict yang bisa di-serialize ke JSON (tanggal ISO)
+    return json.loads(df.to_json(orient='records', date_format='iso'))
+
+
+@dataclass
+class OverviewStats:
+    """
+    Scorecard dan analisis dasar pemberitaan untuk satu state filter
+    """
+    n_sp: int
+    n_berita: int
+    n_media: int
+    n_narasumber: int
+    sp_with_news: int
+    pct_sp_with_news: float
+    avg_news_per_sp: float
+    avg_media_per_sp: float
+    top_news_sp: str = "Tidak ada"
+    top_news_count: int = 0
+    top_media_sp: str = "Tidak ada"
+    top_media_count: int = 0
+
+
+def overview_stats(filtered_sp, cube_cells):
+    """
+    OverviewStats dari siaran pers terfilter dan potongan cube berita-nya
+    """
+    sp_stats = cube_sp_stats(cube_cells)
+    n_sp_total = len(filtered_sp)
+    stats = OverviewStats(
+        n_sp=int(filtered_sp['JUDUL'].nunique()),
+        n_berita=int(cube_cells['COUNT'].sum()),
+        n_media=int(cube_cells['Sumber Media'].nunique()),
+        n_narasumber=int(filtered_sp['NARASUMBER'].nunique()) if 'NARASUMBER' in filtered_sp.columns else 0,
+        sp_with_news=len(sp_stats),
+        pct_sp_with_news=(len(sp_stats) / n_sp_total * 100) if n_sp_total > 0 else 0.0,
+        avg_news_per_sp=float(sp_stats['Berita'].mean()) if len(sp_stats) else 0.0,
+        avg_media_per_sp=float(sp_stats['Media'].mean()) if len(sp_stats) else 0.0,
+    )
+    if len(sp_stats):
+        stats.top_news_sp = str(sp_stats['Berita'].idxmax())
+        stats.top_news_count = int(sp_stats['Berita'].max())
+        stats.top_media_sp = str(sp_stats['Media'].idxmax())
+        stats.top_media_count = int(sp_stats['Media'].max())
+    return stats
+
+
+@dataclass
+class Report:
+    """
+    Hasil analisis lengkap untuk satu rentang tanggal
+    """
+    start_date: object
+    end_date: object
+    overview: OverviewStats
+    media_counts: pd.Series
+    timeline: pd.DataFrame
+    coverage: pd.DataFrame
+    narasumber_counts: pd.Series
+    sp_media_sankey: dict = field(default_factory=dict)
+
+    def to_dict(self):
+        """
+        Versi JSON-friendly dari report
+        """
+        return {
+            'start_date': str(self.start_date),
+            'end_date': str(self.end_date),
+            'overview': vars(self.overview).copy(),
+            'media_counts': {str(k): int(v) for k, v in self.media_counts.items()},
+            'timeline': _records(self.timeline),
+            'coverage': _records(self.coverage),
+            'narasumber_counts': {str(k): int(v) for k, v in self.narasumber_counts.items()},
+            'sp_media_sankey': {k: [str(v) if k == 'labels' else v for v in values]
+                                for k, values in self.sp_media_sankey.items()},
+        }
+
+
+def build_report(sp_df, berita_df, start_date, end_date, titles=None,
+                 window_days=DEFAULT_WINDOW_DAYS, cube=None, narasumber_table=None,
+                 top_sp=5, top_media=8):
+    """
+    Report lengkap (scorecard, media, timeline, jangkauan, narasumber, alur
+    SP ke media) untuk satu rentang tanggal. cube dan narasumber_table yang
+    sudah dibangun bisa diberikan supaya dipakai ulang untuk banyak rentang.
+    """
+    if cube is None:
+        cube = build_daily_cube(berita_df)
+    if narasumber_table is None:
+        narasumber_table = build_narasumber_table(sp_df)
+
+    filtered = filter_sp(sp_df, start_date, end_date, titles)
+    cells = slice_cube(cube, filtered, window_days)
+
+    # Alur SP -> media dari sel cube (berbobot COUNT), hanya top SP dan media
+    sp_counts = cells.groupby('Siaran Pers', observed=True)['COUNT'].sum()
+    top_sp_titles = sp_counts.sort_values(ascending=False, kind='mergesort').head(top_sp).index
+    top_media_names = cube_media_counts(cells).head(top_media).index
+    flow_cells = cells[cells['Siaran Pers'].isin(top_sp_titles) & cells['Sumber Media'].isin(top_media_names)]
+
+    return Report(
+        start_date=start_date,
+        end_date=end_date,
+        overview=overview_stats(filtered, cells),
+        media_counts=cube_media_counts(cells),
+        timeline=cube_timeline(cells),
+        coverage=coverage_by_window(berita_df, filtered),
+        narasumber_counts=slice_narasumber_table(narasumber_table, filtered)['CLEAN_NARASUMBER']
+        .value_counts().sort_values(ascending=False, kind='mergesort'),
+        sp_media_sankey=build_sankey(flow_cells, ['Siaran Pers', 'Sumber Media'], weight='COUNT'),
+    )
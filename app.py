@@ -1,73 +1,162 @@
+import os
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
-import plotly.graph_objs as go
 from datetime import datetime
-from data_loader import load_dataset
+from analytics import (COVERAGE_WINDOWS, build_daily_cube, build_narasumber_table,
+                       build_sankey, coverage_by_window, cube_media_counts,
+                       cube_timeline, filter_berita_positions, filter_sp,
+                       narasumber_weekly_counts, overview_stats, cube_positions,
+                       slice_narasumber_table, volume_category)
+from charts import cached_figure, express_figure, sankey_figure
+from data_loader import (OFFLINE_MODE, dataset_cache_info, dataset_duplicates,
+                         dataset_last_updated, dataset_parse_errors, dataset_version,
+                         load_datasets, refresh_datasets, start_change_watcher)
+from dedup import kept_positions
+from instrumentation import RunProfile, run_records, stage, start_run
+from memo import get_memo, memo_stats
+from paged_table import paged_table
+from search_index import TokenIndex, query_key
+from title_matching import ACCEPT_SCORE, apply_fuzzy_titles, fuzzy_match_titles
 
-def clean_narasumber_name(name):
+# Batas node per tahap diagram Sankey (builder O(n), aman dinaikkan)
+SANKEY_TOP_SP = 5
+SANKEY_TOP_MEDIA = 8
+SANKEY_TOP_NARASUMBER = 10
+SANKEY_TOP_SP_NARASUMBER = 8
+
+# Bagian dashboard yang dirender terpisah (hanya yang dipilih yang dihitung)
+SECTIONS = ["Overview", "Siaran Pers", "Pemberitaan", "Alur Media"]
+
+# Panel debug (waktu per tahap, memo, cProfile) langsung terbuka kalau DASHBOARD_DEBUG=1
+DEBUG_PANEL = os.environ.get("DASHBOARD_DEBUG", "0") == "1"
+
+def format_data_age(timestamp):
     """
-    Clean narasumber name:
-    - If no comma, return full name
-    - If comma exists, return part after comma
+    Teks umur data, mis. "5 menit yang lalu"
     """
-    name = name.strip()
-    if ',' in name:
-        return name.split(',')[1].strip()
-    return name
+    if timestamp is None:
+        return "belum pernah diambil dari Google Sheets"
+    age = max(0, datetime.now().timestamp() - timestamp)
+    if age < 60:
+        return "baru saja"
+    if age < 3600:
+        return f"{int(age // 60)} menit yang lalu"
+    if age < 86400:
+        return f"{int(age // 3600)} jam yang lalu"
+    return f"{int(age // 86400)} hari yang lalu"
 
-def get_filtered_berita(berita_df, filtered_sp):
+def counts_frame(counts, index_name='y', value_name='x'):
+    """
+    Series hitungan (mis. value_counts) sebagai DataFrame dua kolom untuk chart
     """
-    Helper function to get news related to the selected press releases.
+    return pd.DataFrame({index_name: counts.index.astype(object), value_name: counts.to_numpy()})
+
+def get_filtered_positions(berita_df, filtered_sp):
+    """
+    Posisi baris berita yang terkait dengan siaran pers terpilih.
     This will be used for both the scorecard and pemberitaan tab.
+    'Tanggal' and 'PUBLIKASI' are already datetime (parsed once by the loader).
     """
-    # Ensure date columns are datetime
-    berita_df['Tanggal'] = pd.to_datetime(berita_df['Tanggal'], errors='coerce')
-    
-    # If no press releases selected, return empty dataframe
+    # If no press releases selected, no news either
     if filtered_sp.empty:
-        return pd.DataFrame(columns=berita_df.columns)
-    
-    # Filter berita yang relevan dengan siaran pers yang dipilih
-    filtered_berita_indices = []
-    
-    for _, sp_row in filtered_sp.iterrows():
-        sp_date = sp_row['PUBLIKASI']
-        sp_title = sp_row['JUDUL']
-        
-        if pd.isna(sp_date):
-            continue
-            
-        # Temukan berita dalam rentang 3 hari setelah siaran pers
-        # IMPORTANT FIX: Add check for 'Siaran Pers' column to match the title
-        relevant_news = berita_df[
-            (berita_df['Tanggal'] >= sp_date) & 
-            (berita_df['Tanggal'] <= sp_date + pd.Timedelta(days=7)) &
-            (berita_df['Siaran Pers'] == sp_title)  # Match the exact SP title
-        ]
-        
-        filtered_berita_indices.extend(relevant_news.index.tolist())
-    
-    # Hapus duplikat indeks berita
-    filtered_berita_indices = list(set(filtered_berita_indices))
-    
-    # Filter berita berdasarkan indeks yang sudah dikumpulkan
-    if filtered_berita_indices:
-        return berita_df.loc[filtered_berita_indices]
-    else:
-        return pd.DataFrame(columns=berita_df.columns)
+        return np.empty(0, dtype=np.intp)
+
+    # Berita dengan judul SP yang sama, terbit dalam 7 hari setelah siaran pers
+    # (join berbasis set, bukan loop per siaran pers)
+    return filter_berita_positions(berita_df, filtered_sp, window_days=7)
+
+def cached_filtered_berita(berita_df, filtered_sp, filter_state):
+    """
+    Berita terfilter untuk state filter (versi dataset, rentang tanggal, judul
+    SP terpilih). Yang dimemo hanya array posisi barisnya, bukan salinan
+    frame, jadi memori memo tidak bertambah dengan jumlah session; frame
+    diambil dari berita_df bersama setiap kali dipanggil.
+    """
+    with stage('filtered_berita', rows_in=len(berita_df)) as s:
+        positions = get_memo('filtered_berita', maxsize=64).get_or_compute(
+            filter_state, s.track(lambda: get_filtered_positions(berita_df, filtered_sp)))
+        filtered = berita_df.iloc[positions]
+        s.rows_out = len(filtered)
+    return filtered
+
+def cached_coverage(berita_df, filtered_sp, filter_state):
+    """
+    coverage_by_window dimemo per state filter; ganti jendela cukup memilih kolom
+    """
+    with stage('coverage', rows_in=len(filtered_sp)) as s:
+        coverage = get_memo('coverage', maxsize=64).get_or_compute(
+            filter_state, s.track(lambda: coverage_by_window(berita_df, filtered_sp, COVERAGE_WINDOWS)))
+        s.rows_out = len(coverage)
+    return coverage
+
+def cached_cube_slice(berita_df, filtered_sp, filter_state):
+    """
+    Potongan cube harian (Tanggal x Siaran Pers x Sumber Media) untuk state
+    filter. Cube dibangun sekali per versi dataset berita.
+    """
+    with stage('daily_cube', rows_in=len(berita_df)) as s:
+        cube = get_memo('daily_cube', maxsize=4).get_or_compute(
+            filter_state[1], s.track(lambda: build_daily_cube(berita_df)))
+        s.rows_out = len(cube)
+    with stage('cube_slice', rows_in=len(cube)) as s:
+        # Memo menyimpan posisi sel cube, bukan salinan potongannya
+        positions = get_memo('cube_slices', maxsize=64).get_or_compute(
+            filter_state, s.track(lambda: cube_positions(cube, filtered_sp, window_days=7)))
+        cells = cube.iloc[positions]
+        s.rows_out = len(cells)
+    return cells
+
+def search_rows(df, column, version, query):
+    """
+    Label baris df yang kolom judulnya memuat semua kata kunci query (awalan
+    kata), atau None kalau query kosong. Index token dibangun sekali per
+    versi dataset.
+    """
+    if not query_key(query):
+        return None
+    with stage(f'search:{column}', rows_in=len(df)) as s:
+        index = get_memo('search_index', maxsize=4).get_or_compute(
+            (column, version), s.track(lambda: TokenIndex(df[column])))
+        labels = df.index[index.search(query)]
+        s.rows_out = len(labels)
+    return labels
 
-def pemberitaan_tab(berita_df, sp_df, filtered_sp):
+def fuzzy_title_matches(berita_df, sp_df, sp_version, berita_version):
+    """
+    Usulan siaran pers (fuzzy, index trigram) untuk berita yang judul SP-nya
+    tidak persis sama. Dihitung sekali per pasangan versi dataset.
+    """
+    with stage('fuzzy_match', rows_in=len(berita_df)) as s:
+        matches = get_memo('fuzzy_matches', maxsize=4).get_or_compute(
+            (sp_version, berita_version), s.track(lambda: fuzzy_match_titles(berita_df, sp_df, window_days=7)))
+        s.rows_out = len(matches)
+    return matches
+
+def render_match_review(matches):
+    """
+    Berita yang belum cocok atau kecocokannya rendah, untuk dicek manual
+    """
+    review = matches[matches['Skor'] < ACCEPT_SCORE]
+    if review.empty:
+        return
+    unmatched = int((review['sp_pos'] < 0).sum())
+    with st.expander(f"🔍 {unmatched} berita tanpa siaran pers yang cocok, "
+                     f"{len(review) - unmatched} kecocokan rendah"):
+        st.dataframe(review[['Siaran Pers', 'Usulan SP', 'Skor']].sort_values('Skor', ascending=False),
+                     hide_index=True)
+
+def pemberitaan_tab(berita_df, sp_df, filtered_sp, filtered_berita, filter_state):
     st.subheader("📰 Analisis Pemberitaan")
+    # Rentang tanggal sidebar menentukan resolusi timeline
+    date_range = filter_state[2:4]
     
     if not berita_df.empty and not sp_df.empty:
         try:
-            # Ensure date columns are datetime
-            berita_df['Tanggal'] = pd.to_datetime(berita_df['Tanggal'], errors='coerce')
-            
-            # Get filtered news based on the selected press releases
-            filtered_berita = get_filtered_berita(berita_df, filtered_sp)
-            
+            # Hitungan per media dan per hari diambil dari potongan cube harian
+            cube_cells = cached_cube_slice(berita_df, filtered_sp, filter_state)
+
             # Tampilkan jumlah berita yang telah difilter
             st.info(f"Menampilkan {len(filtered_berita)} berita yang relevan dengan Siaran Pers yang dipilih")
             
@@ -78,32 +167,40 @@ def pemberitaan_tab(berita_df, sp_df, filtered_sp):
                 
                 with col1:
                     # Top Media Sources by Volume
-                    media_counts = filtered_berita['Sumber Media'].value_counts().head(10)
-                    fig_media = px.bar(
-                        x=media_counts.values,
-                        y=media_counts.index,
+                    media_counts = cube_media_counts(cube_cells).head(10)
+                    fig_media = cached_figure(
+                        'top_media',
+                        counts_frame(media_counts),
+                        express_figure,
+                        kind='bar',
+                        x='x',
+                        y='y',
                         orientation='h',
                         title="Top 10 Media Sources by Coverage Volume",
-                        labels={'x': 'Jumlah Artikel', 'y': 'Media'}
-                    )
-                    # FIX: Sort bars in descending order
-                    fig_media.update_layout(
-                        height=400,
-                        yaxis={'categoryorder': 'total ascending'}  # This puts highest values at the top
+                        labels={'x': 'Jumlah Artikel', 'y': 'Media'},
+                        # FIX: Sort bars in descending order
+                        layout=dict(
+                            height=400,
+                            yaxis={'categoryorder': 'total ascending'}  # This puts highest values at the top
+                        )
                     )
                     st.plotly_chart(fig_media, use_container_width=True)
                 
                 with col2:
                     # Media Coverage Timeline
-                    timeline = filtered_berita.groupby(filtered_berita['Tanggal'].dt.date).size().reset_index(name='COUNT')
-                    fig_timeline = px.line(
+                    timeline = cube_timeline(cube_cells)
+                    fig_timeline = cached_figure(
+                        'berita_timeline',
                         timeline,
+                        express_figure,
+                        kind='line',
                         x='Tanggal',
                         y='COUNT',
                         title="Media Coverage Timeline",
-                        labels={'Tanggal': 'Tanggal', 'COUNT': 'Jumlah Artikel'}
+                        labels={'Tanggal': 'Tanggal', 'COUNT': 'Jumlah Artikel'},
+                        layout=dict(height=400),
+                        x_range=date_range
                     )
-                    fig_timeline.update_layout(height=400)
                     st.plotly_chart(fig_timeline, use_container_width=True)
             else:
                 st.warning("Tidak cukup data untuk menampilkan Media Coverage Metrics")
@@ -111,31 +208,18 @@ def pemberitaan_tab(berita_df, sp_df, filtered_sp):
             # 2. Press Release Impact Analysis
             st.subheader("Analisis Dampak Siaran Pers")
             
-            # Match press releases with news coverage
-            merged_data = []
-            
-            # Hanya analisis SP yang telah difilter
-            for _, sp_row in filtered_sp.iterrows():
-                sp_date = sp_row['PUBLIKASI']
-                if pd.isna(sp_date):
-                    continue
-                    
-                sp_title = sp_row['JUDUL']
-                
-                # IMPORTANT FIX: Add check for 'Siaran Pers' column to match the title
-                news_count = len(berita_df[
-                    (berita_df['Tanggal'] >= sp_date) & 
-                    (berita_df['Tanggal'] <= sp_date + pd.Timedelta(days=3)) &
-                    (berita_df['Siaran Pers'] == sp_title)  # Match the exact SP title
-                ])
-                
-                merged_data.append({
-                    'Tanggal_SP': sp_date,
-                    'Judul_SP': sp_title,
-                    'Jumlah_Berita': news_count
-                })
-                
-            impact_df = pd.DataFrame(merged_data)
+            # Jangkauan untuk semua jendela dihitung sekali; kontrol hanya memilih kolom
+            coverage = cached_coverage(berita_df, filtered_sp, filter_state)
+            window = st.select_slider(
+                "Jendela pemberitaan setelah siaran pers (hari)",
+                options=list(COVERAGE_WINDOWS),
+                value=3,
+                key="coverage_window"
+            )
+            impact_df = coverage[['Tanggal_SP', 'Judul_SP']].assign(
+                Jumlah_Berita=coverage[f'Berita_{window}'],
+                Jumlah_Media=coverage[f'Media_{window}']
+            )
             
             if not impact_df.empty:
                 # Sort by impact (news count)
@@ -145,44 +229,83 @@ def pemberitaan_tab(berita_df, sp_df, filtered_sp):
                 
                 with col1:
                     # Top Press Releases by Media Coverage
-                    fig_impact = px.bar(
+                    fig_impact = cached_figure(
+                        'top_impact',
                         impact_df.head(10),
+                        express_figure,
+                        kind='bar',
                         x='Jumlah_Berita',
                         y='Judul_SP',
                         orientation='h',
                         title="Top 10 Siaran Pers berdasarkan Jumlah Pemberitaan",
-                        labels={'Jumlah_Berita': 'Jumlah Artikel', 'Judul_SP': 'Siaran Pers'}
-                    )
-                    # FIX: Sort bars in descending order
-                    fig_impact.update_layout(
-                        height=500,
-                        yaxis={'categoryorder': 'total ascending'}  # This puts highest values at the top
+                        labels={'Jumlah_Berita': 'Jumlah Artikel', 'Judul_SP': 'Siaran Pers'},
+                        # FIX: Sort bars in descending order
+                        layout=dict(
+                            height=500,
+                            yaxis={'categoryorder': 'total ascending'}  # This puts highest values at the top
+                        )
                     )
                     st.plotly_chart(fig_impact, use_container_width=True)
                 
                 with col2:
                     # Time to Coverage Analysis
                     # Create a scatter plot showing relationship between press release date and volume of coverage
-                    fig_time = px.scatter(
+                    fig_time = cached_figure(
+                        'impact_time',
                         impact_df,
+                        express_figure,
+                        kind='scatter',
                         x='Tanggal_SP',
                         y='Jumlah_Berita',
                         size='Jumlah_Berita',
                         hover_name='Judul_SP',
                         title="Dampak Siaran Pers dan Waktu",
-                        labels={'Tanggal_SP': 'Tanggal Siaran Pers', 'Jumlah_Berita': 'Jumlah Pemberitaan'}
+                        labels={'Tanggal_SP': 'Tanggal Siaran Pers', 'Jumlah_Berita': 'Jumlah Pemberitaan'},
+                        layout=dict(height=500)
                     )
-                    fig_time.update_layout(height=500)
                     st.plotly_chart(fig_time, use_container_width=True)
             else:
                 st.warning("Tidak ada data impact untuk ditampilkan.")
             
+            # Perbandingan jangkauan antar jendela waktu
+            if not coverage.empty:
+                reach = pd.DataFrame({
+                    'Jendela': [f"{w} hari" for w in COVERAGE_WINDOWS],
+                    'Jumlah Artikel': [coverage[f'Berita_{w}'].sum() for w in COVERAGE_WINDOWS],
+                    'Rata-rata Media per SP': [coverage[f'Media_{w}'].mean() for w in COVERAGE_WINDOWS],
+                })
+                col1, col2 = st.columns(2)
+                with col1:
+                    fig_reach = cached_figure(
+                        'reach_berita',
+                        reach[['Jendela', 'Jumlah Artikel']],
+                        express_figure,
+                        kind='bar',
+                        x='Jendela',
+                        y='Jumlah Artikel',
+                        title="Jumlah Pemberitaan per Jendela Waktu",
+                        layout=dict(height=400)
+                    )
+                    st.plotly_chart(fig_reach, use_container_width=True)
+                with col2:
+                    fig_reach_media = cached_figure(
+                        'reach_media',
+                        reach[['Jendela', 'Rata-rata Media per SP']],
+                        express_figure,
+                        kind='bar',
+                        x='Jendela',
+                        y='Rata-rata Media per SP',
+                        title="Rata-rata Media Unik per Siaran Pers",
+                        layout=dict(height=400)
+                    )
+                    st.plotly_chart(fig_reach_media, use_container_width=True)
+            
             # 3. Media Source Distribution - CHANGE FROM TREEMAP TO PIE CHART
             if not filtered_berita.empty:
                 st.subheader("Distribusi Sumber Media")
                 
                 # Create a pie chart visualization of media sources
-                media_counts = filtered_berita['Sumber Media'].value_counts()
+                media_counts = cube_media_counts(cube_cells)
                 
                 # Get top 10 and sum the rest as "Other"
                 top_media = media_counts.head(10)
@@ -193,13 +316,17 @@ def pemberitaan_tab(berita_df, sp_df, filtered_sp):
                 else:
                     pie_data = top_media
                 
-                fig_pie = px.pie(
-                    values=pie_data.values,
-                    names=pie_data.index,
+                fig_pie = cached_figure(
+                    'media_pie',
+                    counts_frame(pie_data, index_name='names', value_name='values'),
+                    express_figure,
+                    kind='pie',
+                    values='values',
+                    names='names',
                     title="Distribusi Pemberitaan berdasarkan Sumber Media",
-                    color_discrete_sequence=px.colors.sequential.Blues_r  # Use blues to match theme
+                    color_discrete_sequence=px.colors.sequential.Blues_r,  # Use blues to match theme
+                    traces=dict(textposition='inside', textinfo='percent+label')
                 )
-                fig_pie.update_traces(textposition='inside', textinfo='percent+label')
                 st.plotly_chart(fig_pie, use_container_width=True)
                 
                 # 4. Add Sankey diagram to show relationship between SP and Media
@@ -207,11 +334,11 @@ def pemberitaan_tab(berita_df, sp_df, filtered_sp):
                 
                 if not filtered_berita.empty and 'Siaran Pers' in filtered_berita.columns:
                     # Create Sankey data
-                    sankey_df = filtered_berita[['Siaran Pers', 'Sumber Media']].copy()
+                    sankey_df = filtered_berita[['Siaran Pers', 'Sumber Media']]
                     
-                    # Get top 5 SP and top 8 media for clarity
-                    top_sp = sankey_df['Siaran Pers'].value_counts().head(5).index.tolist()
-                    top_media = sankey_df['Sumber Media'].value_counts().head(8).index.tolist()
+                    # Get top SP and top media for clarity
+                    top_sp = sankey_df['Siaran Pers'].value_counts().loc[lambda c: c > 0].head(SANKEY_TOP_SP).index.tolist()
+                    top_media = sankey_df['Sumber Media'].value_counts().loc[lambda c: c > 0].head(SANKEY_TOP_MEDIA).index.tolist()
                     
                     # Filter data to top items
                     sankey_df = sankey_df[
@@ -220,32 +347,10 @@ def pemberitaan_tab(berita_df, sp_df, filtered_sp):
                     ]
                     
                     if not sankey_df.empty:
-                        # Count flows
-                        flow_counts = sankey_df.groupby(['Siaran Pers', 'Sumber Media']).size().reset_index(name='Count')
-                        
-                        # Create lists of unique source and target nodes
-                        all_nodes = list(set(flow_counts['Siaran Pers'].tolist() + flow_counts['Sumber Media'].tolist()))
-                        
-                        # Create source-target mapping
-                        source_indices = [all_nodes.index(sp) for sp in flow_counts['Siaran Pers']]
-                        target_indices = [all_nodes.index(media) for media in flow_counts['Sumber Media']]
-                        
-                        # Create Sankey diagram
-                        fig_sankey = go.Figure(data=[go.Sankey(
-                            node=dict(
-                                pad=15,
-                                thickness=20,
-                                line=dict(color="black", width=0.5),
-                                label=all_nodes
-                            ),
-                            link=dict(
-                                source=source_indices,
-                                target=target_indices,
-                                value=flow_counts['Count'].tolist()
-                            )
-                        )])
-                        
-                        fig_sankey.update_layout(title_text="Alur Siaran Pers ke Media", height=600)
+                        # Bangun node dan link dengan builder Sankey bersama
+                        sankey = build_sankey(sankey_df, ['Siaran Pers', 'Sumber Media'])
+                        fig_sankey = cached_figure('sankey_sp_media', sankey, sankey_figure,
+                                                   title="Alur Siaran Pers ke Media", height=600)
                         st.plotly_chart(fig_sankey, use_container_width=True)
                     else:
                         st.warning("Tidak cukup data untuk membuat diagram Sankey.")
@@ -256,9 +361,18 @@ def pemberitaan_tab(berita_df, sp_df, filtered_sp):
                 # Pilih kolom yang ingin ditampilkan
                 selected_columns = ['Judul Berita', 'Tanggal', 'Sumber Media', 'Siaran Pers', 'Link Berita']
                 
-                # Show dataframe with filtered columns
+                # Pencarian kata kunci judul berita lewat index token
+                news_query = st.text_input("Cari judul berita", key="berita_search",
+                                           placeholder="kata kunci, mis. ekonomi digital")
+                news_matches = search_rows(berita_df, 'Judul Berita', filter_state[1], news_query)
+                if news_matches is not None:
+                    filtered_berita = filtered_berita[filtered_berita.index.isin(news_matches)]
+
+                # Sort, pencarian dan halaman dihitung di server; hanya satu halaman dikirim
                 if not filtered_berita.empty:
-                    st.dataframe(filtered_berita[selected_columns])
+                    paged_table(filtered_berita, "berita_table", columns=selected_columns,
+                                memo_key=(filter_state, query_key(news_query)),
+                                file_name="detail_pemberitaan.csv")
                 else:
                     st.warning("Tidak ada data berita untuk ditampilkan.")
             
@@ -268,23 +382,371 @@ def pemberitaan_tab(berita_df, sp_df, filtered_sp):
         st.warning("Tidak ada data berita untuk ditampilkan.")
 
 
+def render_overview(filtered_sp, cube_cells):
+    """
+    Bagian Overview: scorecard dan analisis dasar pemberitaan, dihitung dari
+    potongan cube harian (bukan baris berita)
+    """
+    st.subheader("💡 Overview")
+    # Semua angka dihitung di analytics.overview_stats (tanpa Streamlit)
+    stats = overview_stats(filtered_sp, cube_cells)
+
+    # Overview - Scorecard - dari potongan cube untuk berita yang terfilter
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Siaran Pers", stats.n_sp)
+    col2.metric("Berita", stats.n_berita)
+    col3.metric("Media", stats.n_media)
+
+    # Add null check and debug information for NARASUMBER
+    if 'NARASUMBER' in filtered_sp.columns:
+        col4.metric("Narasumber", stats.n_narasumber)
+    else:
+        st.warning("NARASUMBER column not found in the dataset")
+
+    # Analisis dasar untuk text box
+    if not cube_cells.empty:
+        st.subheader("📊 Analisis Dasar Pemberitaan")
+
+        # Tampilkan analisis dalam text box
+        st.markdown(f"""
+        #### Analisis Dasar Pemberitaan
+
+        Monitoring pemberitaan dilakukan terhadap **{stats.sp_with_news} siaran pers atau {stats.pct_sp_with_news:.1f}%** dari total **{len(filtered_sp)} siaran pers** yang difilter. 
+
+        Setiap siaran pers memiliki rata-rata pemberitaan sebanyak **{stats.avg_news_per_sp:.1f} berita** dari **{stats.avg_media_per_sp:.1f} media** yang berbeda.
+
+        Siaran pers dengan pemberitaan tertinggi:
+        "**{stats.top_news_sp}**"
+        dengan total **{stats.top_news_count} berita** yang ditulis oleh berbagai media.
+
+        Siaran pers dengan liputan terluas:
+        "**{stats.top_media_sp}**"
+        dengan **{stats.top_media_count} media** berbeda yang memberitakannya.
+        """)
+    else:
+        st.warning("Tidak ada data berita yang sesuai dengan filter untuk ditampilkan.")
+
+def render_siaran_pers(sp_df, filtered_sp, filter_state):
+    """
+    Bagian Siaran Pers: narasumber, timeline, scatter dan Sankey narasumber
+    """
+    sp_version = filter_state[0]
+    # Rentang tanggal sidebar menentukan resolusi timeline
+    date_range = filter_state[2:4]
+    if not filtered_sp.empty:
+        # Check if NARASUMBER column exists
+        if 'NARASUMBER' not in filtered_sp.columns:
+            st.warning("NARASUMBER column is missing from the dataset")
+            return
+
+        try:
+            # Tabel narasumber (split, strip, nama setelah koma, minggu) dibangun
+            # sekali per versi dataset; filter hanya memotong baris SP terpilih
+            with stage('narasumber_table', rows_in=len(sp_df)) as s:
+                narasumber_table = get_memo('narasumber_table', maxsize=4).get_or_compute(
+                    sp_version, s.track(lambda: build_narasumber_table(sp_df)))
+                s.rows_out = len(narasumber_table)
+            narasumber_exploded = slice_narasumber_table(narasumber_table, filtered_sp)
+
+            # Calculate total count for each narasumber
+            narasumber_total_counts = narasumber_exploded['CLEAN_NARASUMBER'].value_counts()
+
+            # Hitung kemunculan per narasumber per minggu
+            narasumber_counts = narasumber_weekly_counts(narasumber_exploded)
+
+            # Buat label kustom untuk hover
+            narasumber_counts = narasumber_counts.assign(custom_label=(
+                narasumber_counts['CLEAN_NARASUMBER'] + '<br>' + 
+                'Rentang=' + narasumber_counts['Week_start'].dt.strftime('%d-%m-%Y') + ' - ' + 
+                narasumber_counts['Week_end'].dt.strftime('%d-%m-%Y') + '<br>' +
+                'Frekuensi=' + narasumber_counts['COUNT'].astype(str) + ' kali'
+            ))
+
+            # Top 10 Narasumber Bar Chart
+            col1, col2 = st.columns(2)
+
+            with col1:
+                # Horizontal Bar Chart for Top 10 Narasumbers, sorted in descending order
+                sorted_narasumber_counts = narasumber_total_counts.sort_values(ascending=False).head(10)
+
+                fig_bar = cached_figure(
+                    'top_narasumber',
+                    counts_frame(sorted_narasumber_counts),
+                    express_figure,
+                    kind='bar',
+                    x='x',
+                    y='y',
+                    orientation='h',
+                    title="Top 10 Narasumber",
+                    labels={'x': 'Frekuensi', 'y': 'Narasumber'},
+                    # FIX: Sort bars in descending order
+                    layout=dict(
+                        xaxis_title="Frekuensi",
+                        yaxis_title="Narasumber",
+                        height=400,
+                        yaxis={'categoryorder': 'total ascending'}  # This puts highest values at the top
+                    )
+                )
+                st.plotly_chart(fig_bar, use_container_width=True)
+
+            with col2:
+                # Timeline Series of Press Releases
+                sp_timeline = filtered_sp.groupby(filtered_sp['PUBLIKASI'].dt.date).size().reset_index(name='COUNT')
+                fig_timeline = cached_figure(
+                    'sp_timeline',
+                    sp_timeline,
+                    express_figure,
+                    kind='line',
+                    x='PUBLIKASI',
+                    y='COUNT',
+                    title="Timeline Siaran Pers",
+                    labels={'PUBLIKASI': 'Tanggal', 'COUNT': 'Jumlah Siaran Pers'},
+                    layout=dict(
+                        xaxis_title="Tanggal",
+                        yaxis_title="Jumlah Siaran Pers",
+                        height=400
+                    ),
+                    x_range=date_range
+                )
+                st.plotly_chart(fig_timeline, use_container_width=True)
+
+            # Narasumber Scatter Plot
+            # FIX: Adjust scatter plot to make it more readable - sort by total appearances
+            narasumber_total_counts = narasumber_counts.groupby('CLEAN_NARASUMBER')['COUNT'].sum().sort_values(ascending=False)
+
+            # Show only top 15 narasumbers for clarity
+            top_narasumbers = narasumber_total_counts.head(15).index.tolist()
+            filtered_scatter_data = narasumber_counts[narasumber_counts['CLEAN_NARASUMBER'].isin(top_narasumbers)]
+
+            # Create new scatter plot with only top narasumbers
+            if not filtered_scatter_data.empty:
+                fig_scatter = cached_figure(
+                    'narasumber_scatter',
+                    filtered_scatter_data,
+                    express_figure,
+                    kind='scatter',
+                    x='Week_start',
+                    y='CLEAN_NARASUMBER',
+                    size='COUNT',
+                    color='CLEAN_NARASUMBER',
+                    title="Top 15 Narasumber Appearances Weekly",
+                    labels={'Week_start': 'Week', 'CLEAN_NARASUMBER': 'Narasumber', 'COUNT': 'Frequency'},
+                    hover_name='custom_label',
+                    traces=dict(
+                        hovertemplate='%{hovertext}<extra></extra>'
+                    ),
+                    layout=dict(
+                        showlegend=False,
+                        autosize=True,
+                        height=600,
+                        width=None,
+                        xaxis_title='Minggu',
+                        yaxis_title='Narasumber',
+                        yaxis={'categoryorder': 'array', 'categoryarray': top_narasumbers[::-1]}
+                    ),
+                    # Format sumbu X untuk menampilkan tanggal dengan lebih baik
+                    xaxes=dict(
+                        tickformat='%d-%m-%Y',
+                        tickmode='auto',
+                        nticks=10
+                    )
+                )
+
+                st.plotly_chart(fig_scatter, use_container_width=True)
+            else:
+                st.warning("Tidak cukup data untuk membuat scatter plot narasumber")
+
+            # Narasumber Sankey Diagram - Shows flow from Narasumbers to Siaran Pers
+            st.subheader("Hubungan Narasumber dan Siaran Pers")
+
+            # Get top narasumbers for the Sankey diagram
+            top_narasumbers = narasumber_total_counts.head(SANKEY_TOP_NARASUMBER).index.tolist()
+            top_sp = filtered_sp['JUDUL'].value_counts().loc[lambda c: c > 0].head(SANKEY_TOP_SP_NARASUMBER).index.tolist()
+
+            # Filter data for the Sankey diagram
+            sankey_data = narasumber_exploded[
+                (narasumber_exploded['CLEAN_NARASUMBER'].isin(top_narasumbers)) &
+                (narasumber_exploded['JUDUL'].isin(top_sp))
+            ]
+
+            if not sankey_data.empty:
+                # Bangun node dan link dengan builder Sankey bersama
+                sankey = build_sankey(sankey_data, ['CLEAN_NARASUMBER', 'JUDUL'])
+                fig_sankey = cached_figure('sankey_narasumber', sankey, sankey_figure,
+                                           title="Alur Narasumber ke Siaran Pers", height=600)
+                st.plotly_chart(fig_sankey, use_container_width=True)
+            else:
+                st.warning("Tidak cukup data untuk membuat diagram Sankey.")
+
+            # Tampilkan tabel siaran pers
+            st.subheader("Daftar Siaran Pers")
+            paged_table(filtered_sp, "sp_table", columns=['JUDUL', 'PUBLIKASI', 'NARASUMBER'],
+                        memo_key=filter_state, file_name="daftar_siaran_pers.csv")
+
+        except Exception as e:
+            st.error(f"Error in Siaran Pers analysis: {e}")
+    else:
+        st.warning("Tidak ada siaran pers yang sesuai dengan filter yang dipilih.")
+
+def render_media_flow(filtered_berita):
+    """
+    Bagian alur Siaran Pers → Media → Volume
+    """
+    # Create Sankey diagram for SP → Media → Volume
+    st.subheader("Alur Siaran Pers ke Media ke Volume")
+
+    if not filtered_berita.empty and 'Siaran Pers' in filtered_berita.columns:
+        # Get top siaran pers for clarity
+        top_sp = filtered_berita['Siaran Pers'].value_counts().loc[lambda c: c > 0].head(SANKEY_TOP_SP).index.tolist()
+
+        # Get top media sources
+        top_media = filtered_berita['Sumber Media'].value_counts().loc[lambda c: c > 0].head(SANKEY_TOP_MEDIA).index.tolist()
+
+        # Filter data for the Sankey diagram
+        sankey_data = filtered_berita[
+            (filtered_berita['Siaran Pers'].isin(top_sp)) & 
+            (filtered_berita['Sumber Media'].isin(top_media))
+        ]
+
+        if not sankey_data.empty:
+            # Tahap volume: kategori jumlah artikel tiap media
+            media_volume = volume_category(sankey_data['Sumber Media'].value_counts().loc[lambda c: c > 0])
+            flow_data = pd.DataFrame({
+                'Siaran Pers': sankey_data['Siaran Pers'],
+                'Sumber Media': sankey_data['Sumber Media'],
+                'Volume': sankey_data['Sumber Media'].map(media_volume)
+            })
+
+            # Bangun node dan link dengan builder Sankey bersama
+            sankey = build_sankey(flow_data, ['Siaran Pers', 'Sumber Media', 'Volume'])
+            fig_sankey = cached_figure(
+                'sankey_media_volume',
+                sankey,
+                sankey_figure,
+                title="Alur Siaran Pers → Media → Volume",
+                height=700,
+                node_color="blue",  # Use blue color theme
+                link_color="rgba(100, 149, 237, 0.6)",  # Use light blue with transparency
+                font=dict(size=12)
+            )
+            st.plotly_chart(fig_sankey, use_container_width=True)
+        else:
+            st.warning("Tidak cukup data untuk membuat diagram Sankey.")
+    else:
+        st.warning("Tidak ada data berita yang sesuai untuk ditampilkan.")
+
+def render_debug_panel(profile=None):
+    """
+    Panel debug opsional di sidebar: waktu per tahap rerun ini, statistik
+    memo/cache dataset, dan hasil cProfile kalau diaktifkan
+    """
+    if not st.sidebar.checkbox("Panel debug", value=DEBUG_PANEL, key="debug_panel"):
+        return
+    with st.sidebar.expander("🛠️ Debug", expanded=True):
+        st.checkbox("Profil setiap rerun (cProfile)", key="profile_rerun")
+
+        records = pd.DataFrame(run_records())
+        if not records.empty:
+            records['stage'] = ['· ' * depth + name for depth, name in zip(records['depth'], records['stage'])]
+            st.markdown("**Tahap rerun ini**")
+            st.dataframe(records.drop(columns='depth'), hide_index=True)
+
+        st.markdown("**Memo**")
+        st.dataframe(pd.DataFrame(memo_stats()).T)
+
+        st.markdown("**Cache dataset**")
+        st.dataframe(pd.DataFrame({str(key[0]): info for key, info in dataset_cache_info().items()}).T)
+
+        if profile:
+            st.markdown("**cProfile**")
+            st.code(profile.report())
+
 def main():
     st.set_page_config(layout="wide", page_title="v1.2 Dashboard Monitoring")
     st.title("DASHBOARD MONITORING 𓀛")
     st.write("Dashboard ini dalam pengembangan, uhuuy")
 
     # Load data
+    # Rekam waktu per tahap rerun ini; cProfile hanya kalau diminta di panel debug
+    start_run()
+    profile = RunProfile() if st.session_state.get("profile_rerun") else None
+    if profile:
+        profile.start()
+
     try:
-        sp_df = load_dataset('DATASET SP')
-        berita_df = load_dataset('DATASET BERITA')
+        # Mode offline: tampilkan data dari snapshot lokal saja
+        offline = st.sidebar.checkbox("Mode Offline (snapshot lokal)", value=OFFLINE_MODE, key="offline_mode")
+
+        # Ambil ulang data dari Google Sheets tanpa menunggu TTL cache habis
+        if st.sidebar.button("Refresh Data", key="refresh_data", disabled=offline):
+            refresh_datasets()
+
+        # Kedua sheet diambil dalam satu request, hanya kolom yang dipakai
+        datasets = load_datasets(offline=offline)
+
+        # Watcher background me-reload data begitu spreadsheet berubah
+        if not offline:
+            try:
+                start_change_watcher()
+            except Exception as e:
+                # Watcher hanya pelengkap: gagal dijalankan tidak boleh menghentikan halaman
+                st.sidebar.caption(f"Deteksi perubahan otomatis tidak aktif: {e}")
+        sp_df = datasets['DATASET SP']
+        berita_df = datasets['DATASET BERITA']
+
+        # Tampilkan umur data (yang paling lama di antara kedua sheet)
+        last_updated = [dataset_last_updated(name) for name in datasets]
+        oldest = None if None in last_updated else min(last_updated)
+        st.caption(f"Data terakhir diperbarui: {format_data_age(oldest)}"
+                   + (" · mode offline" if offline else ""))
 
-        # Konversi tanggal dengan robust
-        sp_df['PUBLIKASI'] = pd.to_datetime(sp_df['PUBLIKASI'], errors='coerce')
-        berita_df['Tanggal'] = pd.to_datetime(berita_df['Tanggal'], errors='coerce')
+        # Tanggal sudah diparse oleh loader; tampilkan baris yang gagal diparse
+        for sheet_name in datasets:
+            parse_errors = dataset_parse_errors(sheet_name)
+            if not parse_errors.empty:
+                with st.expander(f"⚠️ {len(parse_errors)} baris di {sheet_name} gagal diparse"):
+                    st.dataframe(parse_errors)
 
-        # Sort data dari terbaru
-        sp_df = sp_df.sort_values('PUBLIKASI', ascending=False)
-        berita_df = berita_df.sort_values('Tanggal', ascending=False)
+        # Data sudah diurutkan dari terbaru oleh loader (sekali per versi dataset)
+        sp_version = dataset_version(sp_df)
+        berita_version = dataset_version(berita_df)
+
+        # Frame berita dari loader: posisi peta duplikat mengikuti frame ini
+        loaded_berita_df = berita_df
+
+        # Judul SP di sheet berita yang salah ketik/terpotong: usulkan SP terdekat.
+        # Pencocokan hanya dihitung kalau diaktifkan (sekali per versi dataset)
+        if not (sp_df.empty or berita_df.empty):
+            if st.sidebar.checkbox("Pakai pencocokan fuzzy judul SP", key="fuzzy_titles",
+                                   help=f"Berita dengan skor kemiripan judul >= {ACCEPT_SCORE:g} ikut dihitung"):
+                matches = fuzzy_title_matches(berita_df, sp_df, sp_version, berita_version)
+                render_match_review(matches)
+                berita_df = get_memo('fuzzy_berita', maxsize=4).get_or_compute(
+                    (sp_version, berita_version), lambda: apply_fuzzy_titles(berita_df, matches))
+                # Judul hasil fuzzy bergantung pada kedua sheet: versi SP ikut masuk
+                # ke versi turunan (key cube harian, memo dedup, dst.)
+                berita_version = f"{berita_version}:fuzzy:{sp_version}"
+
+        # Hitung dengan atau tanpa berita duplikat. Peta duplikat disiapkan
+        # loader di background per versi dataset; selama belum siap berita
+        # dihitung apa adanya
+        if not berita_df.empty and st.sidebar.checkbox(
+                "Abaikan berita duplikat", key="skip_duplicates",
+                help="Berita dengan link sama atau judul hampir sama untuk siaran pers yang sama "
+                     "hanya dihitung sekali (yang paling awal)"):
+            duplicates = dataset_duplicates(loaded_berita_df)
+            if duplicates is None:
+                st.sidebar.caption("⏳ Peta duplikat sedang disiapkan; berita duplikat belum diabaikan")
+                st.sidebar.button("Cek lagi", key="duplicates_retry")
+            else:
+                reasons = duplicates['Alasan'].value_counts()
+                st.sidebar.caption(f"{reasons.get('Link', 0)} berita dengan link sama, "
+                                   f"{reasons.get('Judul', 0)} dengan judul hampir sama diabaikan")
+                # Yang dimemo hanya posisi baris yang dipertahankan (per versi loader)
+                positions = get_memo('dedup_positions', maxsize=4).get_or_compute(
+                    dataset_version(loaded_berita_df), lambda: kept_positions(duplicates))
+                berita_df = berita_df.iloc[positions]
+                berita_version = f"{berita_version}:dedup"
 
         # Sidebar untuk filter
         st.sidebar.header("Filter")
@@ -309,10 +771,16 @@ def main():
         )
 
         # Filter Siaran Pers berdasarkan rentang waktu
-        filtered_sp = sp_df[
-            (sp_df['PUBLIKASI'].dt.date >= start_date) &
-            (sp_df['PUBLIKASI'].dt.date <= end_date)
-        ]
+        with stage('filter_sp', rows_in=len(sp_df)) as s:
+            filtered_sp = filter_sp(sp_df, start_date, end_date)
+            s.rows_out = len(filtered_sp)
+
+        # Pencarian kata kunci judul siaran pers (index token per versi dataset)
+        sp_query = st.sidebar.text_input("Cari Siaran Pers", key="sp_search",
+                                         placeholder="kata kunci judul")
+        sp_matches = search_rows(sp_df, 'JUDUL', sp_version, sp_query)
+        if sp_matches is not None:
+            filtered_sp = filtered_sp[filtered_sp.index.isin(sp_matches)]
 
         # Filter Siaran Pers berdasarkan pilihan judul
         selected_siaran_pers = st.sidebar.multiselect(
@@ -322,384 +790,38 @@ def main():
         if selected_siaran_pers:
             filtered_sp = filtered_sp[filtered_sp['JUDUL'].isin(selected_siaran_pers)]
 
-        # Get filtered news based on the selected press releases - IMPORTANT TO GET CORRECT FILTERING
-        filtered_berita = get_filtered_berita(berita_df, filtered_sp)
-
-        st.subheader("💡 Overview")
-        # Overview - Scorecard - UPDATED to use filtered_berita
-        col1, col2, col3, col4 = st.columns(4)
-        col1.metric("Siaran Pers", filtered_sp['JUDUL'].nunique() if not filtered_sp.empty else 0)
-        col2.metric("Berita", len(filtered_berita) if not filtered_berita.empty else 0)
-        col3.metric("Media", filtered_berita['Sumber Media'].nunique() if 'Sumber Media' in filtered_berita.columns and not filtered_berita.empty else 0)
-        
-        # Add null check and debug information for NARASUMBER
-        if 'NARASUMBER' in filtered_sp.columns:
-            col4.metric("Narasumber", filtered_sp['NARASUMBER'].nunique() if not filtered_sp['NARASUMBER'].isnull().all() else 0)
-        else:
-            st.warning("NARASUMBER column not found in the dataset")
+        # State filter saat ini: key memo untuk semua hasil turunan filter
+        filter_state = (sp_version, berita_version, start_date, end_date,
+                        tuple(sorted(selected_siaran_pers)), query_key(sp_query))
 
-        # Analisis dasar untuk text box
-        if not filtered_berita.empty and 'Siaran Pers' in filtered_berita.columns:
-            st.subheader("📊 Analisis Dasar Pemberitaan")
-    
-            # 1. Hitung siaran pers yang memiliki berita (nilai unik di kolom Siaran Pers)
-            sp_with_news = filtered_berita['Siaran Pers'].unique()
-            total_sp_with_news = len(sp_with_news)
-    
-            # Total siaran pers di dataset yang telah difilter
-            total_sp = len(filtered_sp) if not filtered_sp.empty else 0
-    
-            # Persentase siaran pers yang mendapat pemberitaan
-            percentage_sp_with_news = (total_sp_with_news / total_sp * 100) if total_sp > 0 else 0
-    
-            # 2. Hitung jumlah berita per siaran pers
-            sp_news_counts = filtered_berita.groupby('Siaran Pers').size().to_dict()
-    
-            # 3. Rata-rata pemberitaan per siaran pers (hanya yang memiliki berita)
-            avg_news_per_sp = filtered_berita.groupby('Siaran Pers').size().mean() if total_sp_with_news > 0 else 0
-    
-            # 4. Hitung jumlah media unik per siaran pers
-            sp_media_counts = filtered_berita.groupby('Siaran Pers')['Sumber Media'].nunique().to_dict()
-    
-            # Rata-rata media per siaran pers
-            avg_media_per_sp = filtered_berita.groupby('Siaran Pers')['Sumber Media'].nunique().mean() if total_sp_with_news > 0 else 0
-    
-            # Temukan SP dengan pemberitaan tertinggi
-            if sp_news_counts:
-                max_news_sp = max(sp_news_counts.items(), key=lambda x: x[1])
-            else:
-                max_news_sp = ("Tidak ada", 0)
-    
-            # Temukan SP dengan coverage media tertinggi
-            if sp_media_counts:
-                max_media_sp = max(sp_media_counts.items(), key=lambda x: x[1])
-            else:
-                max_media_sp = ("Tidak ada", 0)
-    
-            # Tampilkan analisis dalam text box
-            st.markdown(f"""
-            #### Analisis Dasar Pemberitaan
-    
-            Monitoring pemberitaan dilakukan terhadap **{total_sp_with_news} siaran pers atau {percentage_sp_with_news:.1f}%** dari total **{total_sp} siaran pers** yang difilter. 
-    
-            Setiap siaran pers memiliki rata-rata pemberitaan sebanyak **{avg_news_per_sp:.1f} berita** dari **{avg_media_per_sp:.1f} media** yang berbeda.
-            
-            Siaran pers dengan pemberitaan tertinggi:
-            "**{max_news_sp[0]}**"
-            dengan total **{max_news_sp[1]} berita** yang ditulis oleh berbagai media.
-    
-            Siaran pers dengan liputan terluas:
-            "**{max_media_sp[0]}**"
-            dengan **{max_media_sp[1]} media** berbeda yang memberitakannya.
-            """)
-        else:
-            st.warning("Tidak ada data berita yang sesuai dengan filter untuk ditampilkan.")
-
-        # Create tabs after the overview section
-        tab1, tab2 = st.tabs(["Siaran Pers", "Pemberitaan"])
-        
-        # Tab 1: Siaran Pers (all current visualizations)
-        with tab1:
-            if not filtered_sp.empty:
-                # Check if NARASUMBER column exists
-                if 'NARASUMBER' not in filtered_sp.columns:
-                    st.warning("NARASUMBER column is missing from the dataset")
-                    return
-
-                try:
-                    # Handle potential None or NaN values
-                    filtered_sp['NARASUMBER'] = filtered_sp['NARASUMBER'].fillna('')
-                    
-                    # Split and explode the NARASUMBER column
-                    narasumber_df = filtered_sp.copy()
-                    narasumber_df['NARASUMBER'] = narasumber_df['NARASUMBER'].str.split(';')
-                    narasumber_exploded = narasumber_df.explode('NARASUMBER')
-                    
-                    # Clean and count narasumbers
-                    narasumber_exploded['NARASUMBER'] = narasumber_exploded['NARASUMBER'].str.strip()
-                    narasumber_exploded['CLEAN_NARASUMBER'] = narasumber_exploded['NARASUMBER'].apply(clean_narasumber_name)
-                    
-                    # Calculate total count for each narasumber
-                    narasumber_total_counts = narasumber_exploded[narasumber_exploded['CLEAN_NARASUMBER'] != '']['CLEAN_NARASUMBER'].value_counts()
-
-                    # Pastikan PUBLIKASI adalah tipe datetime
-                    if not pd.api.types.is_datetime64_any_dtype(narasumber_exploded['PUBLIKASI']):
-                        narasumber_exploded['PUBLIKASI'] = pd.to_datetime(narasumber_exploded['PUBLIKASI'])
-
-                    # Tambahkan kolom Week untuk mengelompokkan berdasarkan minggu
-                    narasumber_exploded['Week'] = narasumber_exploded['PUBLIKASI'].dt.to_period('W')
-                    narasumber_exploded['Week_start'] = narasumber_exploded['Week'].dt.start_time
-                    narasumber_exploded['Week_end'] = narasumber_exploded['Week'].dt.end_time
-
-                    # Hitung kemunculan per narasumber per minggu
-                    narasumber_counts = narasumber_exploded[narasumber_exploded['CLEAN_NARASUMBER'] != ''].groupby(['CLEAN_NARASUMBER', 'Week', 'Week_start', 'Week_end']).size().reset_index(name='COUNT')
-
-                    # Buat label kustom untuk hover
-                    narasumber_counts['custom_label'] = (
-                        narasumber_counts['CLEAN_NARASUMBER'] + '<br>' + 
-                        'Rentang=' + narasumber_counts['Week_start'].dt.strftime('%d-%m-%Y') + ' - ' + 
-                        narasumber_counts['Week_end'].dt.strftime('%d-%m-%Y') + '<br>' +
-                        'Frekuensi=' + narasumber_counts['COUNT'].astype(str) + ' kali'
-                    )
+        # Get filtered news based on the selected press releases - IMPORTANT TO GET CORRECT FILTERING
+        # Dihitung (atau diambil dari memo) hanya oleh bagian yang membutuhkannya
+        def get_filtered():
+            return cached_filtered_berita(berita_df, filtered_sp, filter_state)
 
-                    # Top 10 Narasumber Bar Chart
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        # Horizontal Bar Chart for Top 10 Narasumbers, sorted in descending order
-                        sorted_narasumber_counts = narasumber_total_counts.sort_values(ascending=False).head(10)
-        
-                        fig_bar = px.bar(
-                            x=sorted_narasumber_counts.values, 
-                            y=sorted_narasumber_counts.index,
-                            orientation='h',
-                            title="Top 10 Narasumber",
-                            labels={'x': 'Frekuensi', 'y': 'Narasumber'}
-                        )
-                        # FIX: Sort bars in descending order
-                        fig_bar.update_layout(
-                            xaxis_title="Frekuensi",
-                            yaxis_title="Narasumber",
-                            height=400,
-                            yaxis={'categoryorder': 'total ascending'}  # This puts highest values at the top
-                        )
-                        st.plotly_chart(fig_bar, use_container_width=True)
-                    
-                    with col2:
-                        # Timeline Series of Press Releases
-                        sp_timeline = filtered_sp.groupby(filtered_sp['PUBLIKASI'].dt.date).size().reset_index(name='COUNT')
-                        fig_timeline = px.line(
-                            sp_timeline, 
-                            x='PUBLIKASI', 
-                            y='COUNT',
-                            title="Timeline Siaran Pers",
-                            labels={'PUBLIKASI': 'Tanggal', 'COUNT': 'Jumlah Siaran Pers'}
-                        )
-                        fig_timeline.update_layout(
-                            xaxis_title="Tanggal",
-                            yaxis_title="Jumlah Siaran Pers",
-                            height=400
-                        )
-                        st.plotly_chart(fig_timeline, use_container_width=True)
-
-                    # Narasumber Scatter Plot
-                    fig_scatter = px.scatter(
-                        narasumber_counts, 
-                        x='Week_start',  # Gunakan tanggal awal minggu sebagai sumbu X
-                        y='CLEAN_NARASUMBER',
-                        size='COUNT',
-                        color='CLEAN_NARASUMBER',
-                        title="Narasumber Appearances Weekly",
-                        labels={'Week_start': 'Week', 'CLEAN_NARASUMBER': 'Narasumber', 'COUNT': 'Frequency'},
-                        hover_name='custom_label',  # Gunakan label kustom untuk hover
-                        custom_data=['COUNT', 'Week_start', 'Week_end']  # Data tambahan untuk hover
-                    )
+        # Hanya bagian yang dipilih yang dihitung dan dirender; interaksi di
+        # dalam satu bagian tidak menghitung ulang bagian lain
+        section = st.radio("Bagian", SECTIONS, horizontal=True, key="section",
+                           label_visibility="collapsed")
 
-                    # Atur format hover
-                    fig_scatter.update_traces(
-                        hovertemplate='%{hovertext}<extra></extra>'
-                    )
+        with stage(f'render:{section}'):
+            if section == "Overview":
+                render_overview(filtered_sp, cached_cube_slice(berita_df, filtered_sp, filter_state))
+            elif section == "Siaran Pers":
+                render_siaran_pers(sp_df, filtered_sp, filter_state)
+            elif section == "Pemberitaan":
+                pemberitaan_tab(berita_df, sp_df, filtered_sp, get_filtered(), filter_state)
+            elif section == "Alur Media":
+                render_media_flow(get_filtered())
 
-                    # FIX: Adjust scatter plot to make it more readable - sort by total appearances
-                    narasumber_total_counts = narasumber_counts.groupby('CLEAN_NARASUMBER')['COUNT'].sum().sort_values(ascending=False)
-                    
-                    # Show only top 15 narasumbers for clarity
-                    top_narasumbers = narasumber_total_counts.head(15).index.tolist()
-                    filtered_scatter_data = narasumber_counts[narasumber_counts['CLEAN_NARASUMBER'].isin(top_narasumbers)]
-                    
-                    # Create new scatter plot with only top narasumbers
-                    if not filtered_scatter_data.empty:
-                        fig_scatter = px.scatter(
-                            filtered_scatter_data, 
-                            x='Week_start',
-                            y='CLEAN_NARASUMBER',
-                            size='COUNT',
-                            color='CLEAN_NARASUMBER',
-                            title="Top 15 Narasumber Appearances Weekly",
-                            labels={'Week_start': 'Week', 'CLEAN_NARASUMBER': 'Narasumber', 'COUNT': 'Frequency'},
-                            hover_name='custom_label'
-                        )
-                        
-                        fig_scatter.update_traces(
-                            hovertemplate='%{hovertext}<extra></extra>'
-                        )
-                        
-                        fig_scatter.update_layout(
-                            showlegend=False,
-                            autosize=True,
-                            height=600,
-                            width=None,
-                            xaxis_title='Minggu',
-                            yaxis_title='Narasumber',
-                            yaxis={'categoryorder': 'array', 'categoryarray': top_narasumbers[::-1]}
-                        )
-                        
-                        # Format sumbu X untuk menampilkan tanggal dengan lebih baik
-                        fig_scatter.update_xaxes(
-                            tickformat='%d-%m-%Y',
-                            tickmode='auto',
-                            nticks=10
-                        )
-                        
-                        st.plotly_chart(fig_scatter, use_container_width=True)
-                    else:
-                        st.warning("Tidak cukup data untuk membuat scatter plot narasumber")
-                    
-                    # Narasumber Sankey Diagram - Shows flow from Narasumbers to Siaran Pers
-                    st.subheader("Hubungan Narasumber dan Siaran Pers")
-                    
-                    # Get top 10 narasumbers for the Sankey diagram
-                    top_narasumbers = narasumber_total_counts.head(10).index.tolist()
-                    top_sp = filtered_sp['JUDUL'].value_counts().head(8).index.tolist()
-                    
-                    # Filter data for the Sankey diagram
-                    sankey_data = narasumber_exploded[
-                        (narasumber_exploded['CLEAN_NARASUMBER'].isin(top_narasumbers)) &
-                        (narasumber_exploded['JUDUL'].isin(top_sp))
-                    ]
-                    
-                    if not sankey_data.empty:
-                        # Count flows
-                        flow_counts = sankey_data.groupby(['CLEAN_NARASUMBER', 'JUDUL']).size().reset_index(name='Count')
-                        
-                        # Create lists of unique source and target nodes
-                        all_nodes = list(set(flow_counts['CLEAN_NARASUMBER'].tolist() + flow_counts['JUDUL'].tolist()))
-                        
-                        # Create source-target mapping
-                        source_indices = [all_nodes.index(ns) for ns in flow_counts['CLEAN_NARASUMBER']]
-                        target_indices = [all_nodes.index(sp) for sp in flow_counts['JUDUL']]
-                        
-                        # Create Sankey diagram
-                        fig_sankey = go.Figure(data=[go.Sankey(
-                            node=dict(
-                                pad=15,
-                                thickness=20,
-                                line=dict(color="black", width=0.5),
-                                label=all_nodes
-                            ),
-                            link=dict(
-                                source=source_indices,
-                                target=target_indices,
-                                value=flow_counts['Count'].tolist()
-                            )
-                        )])
-                        
-                        fig_sankey.update_layout(title_text="Alur Narasumber ke Siaran Pers", height=600)
-                        st.plotly_chart(fig_sankey, use_container_width=True)
-                    else:
-                        st.warning("Tidak cukup data untuk membuat diagram Sankey.")
-                    
-                    # Tampilkan tabel siaran pers
-                    st.subheader("Daftar Siaran Pers")
-                    st.dataframe(filtered_sp[['JUDUL', 'PUBLIKASI', 'NARASUMBER']])
-                    
-                except Exception as e:
-                    st.error(f"Error in Siaran Pers analysis: {e}")
-            else:
-                st.warning("Tidak ada siaran pers yang sesuai dengan filter yang dipilih.")
-        
-        # Tab 2: Pemberitaan analysis with Sankey from SP → Media → Volume
-        with tab2:
-            pemberitaan_tab(berita_df, sp_df, filtered_sp)
-            
-            # Create Sankey diagram for SP → Media → Volume
-            st.subheader("Alur Siaran Pers ke Media ke Volume")
-            
-            # Get filtered news based on selected press releases
-            filtered_berita = get_filtered_berita(berita_df, filtered_sp)
-            
-            if not filtered_berita.empty and 'Siaran Pers' in filtered_berita.columns:
-                # Get top siaran pers for clarity
-                top_sp = filtered_berita['Siaran Pers'].value_counts().head(5).index.tolist()
-                
-                # Get top media sources
-                top_media = filtered_berita['Sumber Media'].value_counts().head(8).index.tolist()
-                
-                # Filter data for the Sankey diagram
-                sankey_data = filtered_berita[
-                    (filtered_berita['Siaran Pers'].isin(top_sp)) & 
-                    (filtered_berita['Sumber Media'].isin(top_media))
-                ]
-                
-                if not sankey_data.empty:
-                    # Count SP to Media flows
-                    flow_sp_media = sankey_data.groupby(['Siaran Pers', 'Sumber Media']).size().reset_index(name='Count')
-                    
-                    # Create volume category nodes for media
-                    volume_categories = ['Low (1-2)', 'Medium (3-5)', 'High (6+)']
-                    flow_media_volume = []
-                    
-                    for media in top_media:
-                        media_count = sankey_data[sankey_data['Sumber Media'] == media].shape[0]
-                        if media_count <= 2:
-                            volume_cat = 'Low (1-2)'
-                        elif media_count <= 5:
-                            volume_cat = 'Medium (3-5)'
-                        else:
-                            volume_cat = 'High (6+)'
-                        
-                        flow_media_volume.append({
-                            'Sumber Media': media,
-                            'Volume': volume_cat,
-                            'Count': media_count
-                        })
-                    
-                    flow_media_volume_df = pd.DataFrame(flow_media_volume)
-                    
-                    # Create complete node list
-                    all_nodes = list(set(
-                        flow_sp_media['Siaran Pers'].tolist() + 
-                        flow_sp_media['Sumber Media'].tolist() + 
-                        volume_categories
-                    ))
-                    
-                    # Create source-target mappings for SP -> Media
-                    source_sp_media = [all_nodes.index(sp) for sp in flow_sp_media['Siaran Pers']]
-                    target_sp_media = [all_nodes.index(media) for media in flow_sp_media['Sumber Media']]
-                    values_sp_media = flow_sp_media['Count'].tolist()
-                    
-                    # Create source-target mappings for Media -> Volume
-                    source_media_volume = [all_nodes.index(row['Sumber Media']) for _, row in flow_media_volume_df.iterrows()]
-                    target_media_volume = [all_nodes.index(row['Volume']) for _, row in flow_media_volume_df.iterrows()]
-                    values_media_volume = flow_media_volume_df['Count'].tolist()
-                    
-                    # Combine all links
-                    sources = source_sp_media + source_media_volume
-                    targets = target_sp_media + target_media_volume
-                    values = values_sp_media + values_media_volume
-                    
-                    # Create Sankey diagram
-                    fig_sankey = go.Figure(data=[go.Sankey(
-                        node=dict(
-                            pad=15,
-                            thickness=20,
-                            line=dict(color="black", width=0.5),
-                            label=all_nodes,
-                            color="blue"  # Use blue color theme
-                        ),
-                        link=dict(
-                            source=sources,
-                            target=targets,
-                            value=values,
-                            color="rgba(100, 149, 237, 0.6)"  # Use light blue with transparency
-                        )
-                    )])
-                    
-                    fig_sankey.update_layout(
-                        title_text="Alur Siaran Pers → Media → Volume", 
-                        height=700,
-                        font=dict(size=12)
-                    )
-                    st.plotly_chart(fig_sankey, use_container_width=True)
-                else:
-                    st.warning("Tidak cukup data untuk membuat diagram Sankey.")
-            else:
-                st.warning("Tidak ada data berita yang sesuai untuk ditampilkan.")
-            
     except Exception as e:
         st.error(f"Error loading or processing data: {e}")
         import traceback
         st.error(traceback.format_exc())
 
+    if profile:
+        profile.stop()
+    render_debug_panel(profile)
+
 if __name__ == "__main__":
     main()
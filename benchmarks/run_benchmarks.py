@@ -0,0 +1,152 @@
+"""
+Benchmark tahap-tahap berat dashboard dengan data sintetis:
+
+    python benchmarks/run_benchmarks.py --sizes 1000 10000 100000 1000000 -o bench.json
+
+Untuk tiap ukuran, setiap tahap diukur waktu wall-nya (terbaik dari --repeat
+kali) lalu sekali lagi dengan tracemalloc untuk puncak memori. Hasil disimpan
+sebagai JSON sehingga bisa dibandingkan antar versi.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics import (COVERAGE_WINDOWS, build_daily_cube, build_narasumber_table,  # noqa: E402
+                       build_sankey, coverage_by_window, filter_berita_positions,
+                       narasumber_weekly_counts, overview_stats, slice_cube,
+                       slice_narasumber_table, volume_category)
+from schema import SHEET_SCHEMAS, normalize_frame  # noqa: E402
+from synthetic import generate  # noqa: E402
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+
+def _sp_media_volume(berita):
+    # Alur SP -> Media -> Volume seperti bagian "Alur Media"
+    top_sp = berita['Siaran Pers'].value_counts().head(5).index
+    top_media = berita['Sumber Media'].value_counts().head(8).index
+    data = berita[berita['Siaran Pers'].isin(top_sp) & berita['Sumber Media'].isin(top_media)]
+    volume = volume_category(data['Sumber Media'].value_counts().loc[lambda c: c > 0])
+    flow = pd.DataFrame({
+        'Siaran Pers': data['Siaran Pers'],
+        'Sumber Media': data['Sumber Media'],
+        'Volume': data['Sumber Media'].map(volume),
+    })
+    return build_sankey(flow, ['Siaran Pers', 'Sumber Media', 'Volume'])
+
+
+# (nama tahap, fungsi(ctx) -> hasil, kolom ctx yang dihitung sebagai rows_in)
+STAGES = [
+    ('normalize_sp', lambda ctx: normalize_frame(ctx['raw_sp'], SHEET_SCHEMAS['DATASET SP'])[0], 'raw_sp'),
+    ('normalize_berita', lambda ctx: normalize_frame(ctx['raw_berita'], SHEET_SCHEMAS['DATASET BERITA'])[0],
+     'raw_berita'),
+    ('filter_berita', lambda ctx: ctx['normalize_berita'].iloc[
+        filter_berita_positions(ctx['normalize_berita'], ctx['normalize_sp'])], 'normalize_berita'),
+    ('coverage_by_window', lambda ctx: coverage_by_window(ctx['normalize_berita'], ctx['normalize_sp'],
+                                                          COVERAGE_WINDOWS), 'normalize_berita'),
+    ('narasumber_table', lambda ctx: build_narasumber_table(ctx['normalize_sp']), 'normalize_sp'),
+    ('narasumber_weekly', lambda ctx: narasumber_weekly_counts(
+        slice_narasumber_table(ctx['narasumber_table'], ctx['normalize_sp'])), 'narasumber_table'),
+    ('daily_cube', lambda ctx: build_daily_cube(ctx['normalize_berita']), 'normalize_berita'),
+    ('cube_slice', lambda ctx: slice_cube(ctx['daily_cube'], ctx['normalize_sp']), 'daily_cube'),
+    ('overview_stats', lambda ctx: overview_stats(ctx['normalize_sp'], ctx['cube_slice']), 'cube_slice'),
+    ('sankey_sp_media', lambda ctx: build_sankey(ctx['filter_berita'], ['Siaran Pers', 'Sumber Media']),
+     'filter_berita'),
+    ('sankey_sp_media_volume', lambda ctx: _sp_media_volume(ctx['filter_berita']), 'filter_berita'),
+]
+
+
+def _rows(value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return len(value)
+    if isinstance(value, dict) and 'value' in value:
+        return len(value['value'])
+    return None
+
+
+def run_size(n_articles, repeat=3, memory=True, seed=0):
+    """
+    Hasil semua tahap untuk satu ukuran data (list of dict)
+    """
+    raw_sp, raw_berita = generate(n_articles, seed=seed)
+    ctx = {'raw_sp': raw_sp, 'raw_berita': raw_berita}
+    results = []
+    for name, stage, input_key in STAGES:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            value = stage(ctx)
+            timings.append(time.perf_counter() - start)
+
+        peak = None
+        if memory:
+            tracemalloc.start()
+            stage(ctx)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        ctx[name] = value
+        results.append({
+            'articles': n_articles,
+            'stage': name,
+            'seconds_min': min(timings),
+            'seconds_median': float(np.median(timings)),
+            'peak_bytes': peak,
+            'rows_in': _rows(ctx[input_key]),
+            'rows_out': _rows(value),
+        })
+        print(f"{n_articles:>9} {name:<24} {min(timings) * 1000:10.1f} ms"
+              + (f" {peak / 2**20:9.1f} MiB" if peak is not None else ""), file=sys.stderr)
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark tahap analisis dashboard dengan data sintetis")
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES, help="jumlah berita")
+    parser.add_argument("--repeat", type=int, default=3, help="pengulangan per tahap (diambil yang tercepat)")
+    parser.add_argument("--no-memory", action="store_true", help="lewati pengukuran tracemalloc")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", default="benchmark_results.json", help="file JSON hasil")
+    args = parser.parse_args(argv)
+
+    report = {
+        'meta': {
+            'timestamp': time.time(),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'repeat': args.repeat,
+            'seed': args.seed,
+        },
+        'results': [],
+    }
+    for size in args.sizes:
+        report['results'].extend(run_size(size, args.repeat, not args.no_memory, args.seed))
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Hasil disimpan di {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Generator data sintetis berbentuk sheet DATASET SP dan DATASET BERITA (semua
+nilai string, seperti hasil Google Sheets) untuk benchmark tanpa akses ke
+spreadsheet asli.
+"""
+import numpy as np
+import pandas as pd
+
+# Kira-kira sekian berita per siaran pers
+ARTICLES_PER_SP = 20
+
+FIRST_NAMES = ["Budi", "Ani", "Sari", "Joko", "Rina", "Agus", "Dewi", "Hendra", "Lestari", "Wahyu",
+               "Putri", "Eko", "Fitri", "Bambang", "Yuni", "Rudi", "Maya", "Teguh", "Indah", "Arif"]
+LAST_NAMES = ["Santoso", "Wijaya", "Pratama", "Kusuma", "Hidayat", "Saputra", "Nugroho", "Lubis"]
+POSITIONS = ["Menteri", "Wakil Menteri", "Sekretaris Jenderal", "Dirjen", "Kepala Biro", "Staf Ahli"]
+TOPICS = ["ekonomi digital", "infrastruktur", "pangan", "energi", "pendidikan", "kesehatan",
+          "UMKM", "pariwisata", "investasi", "ekspor", "transportasi", "perumahan"]
+
+
+def _narasumber_pool(rng, size=200):
+    # Sebagian nama memakai format "Jabatan, Nama" supaya pembersihan nama ikut teruji
+    names = [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}" for _ in range(size)]
+    return np.array([f"{rng.choice(POSITIONS)}, {name}" if rng.random() < 0.4 else name
+                     for name in names], dtype=object)
+
+
+def generate(n_articles, seed=0, n_media=300, start="2019-01-01", years=5):
+    """
+    (sp_df, berita_df) sintetis dengan:
+    - distribusi media miring (Zipf): sedikit media besar, banyak media kecil
+    - sel NARASUMBER berisi 0-4 nama dipisah ';' (sebagian "Jabatan, Nama")
+    - tanggal siaran pers tersebar beberapa tahun, berita 0-30 hari setelahnya
+      (sebagian di luar jendela 7 hari) dan sebagian kecil judul tidak cocok
+    """
+    rng = np.random.default_rng(seed)
+    n_sp = max(50, n_articles // ARTICLES_PER_SP)
+
+    base = pd.Timestamp(start)
+    publikasi = base + pd.to_timedelta(rng.integers(0, years * 365, n_sp), unit='D')
+    titles = np.array([f"Siaran Pers {i}: {TOPICS[i % len(TOPICS)]} tahap {i // len(TOPICS)}"
+                       for i in range(n_sp)], dtype=object)
+
+    pool = _narasumber_pool(rng)
+    n_names = rng.choice([0, 1, 2, 3, 4], size=n_sp, p=[0.1, 0.4, 0.3, 0.15, 0.05])
+    narasumber = [";".join(rng.choice(pool, size=k, replace=False)) for k in n_names]
+
+    sp_df = pd.DataFrame({
+        'NO': np.arange(1, n_sp + 1).astype(str),
+        'JUDUL': titles,
+        'PUBLIKASI': publikasi.strftime('%Y-%m-%d'),
+        'NARASUMBER': narasumber,
+    })
+
+    # Popularitas siaran pers juga miring: beberapa SP diberitakan jauh lebih banyak
+    sp_weights = rng.pareto(1.5, n_sp) + 1
+    sp_idx = rng.choice(n_sp, size=n_articles, p=sp_weights / sp_weights.sum())
+
+    media_weights = 1 / np.arange(1, n_media + 1) ** 1.1
+    media_names = np.array([f"media{i:03d}.co.id" for i in range(n_media)], dtype=object)
+    media = media_names[rng.choice(n_media, size=n_articles, p=media_weights / media_weights.sum())]
+
+    lag = np.minimum(rng.exponential(4, n_articles).astype(int), 30)
+    tanggal = publikasi[sp_idx] + pd.to_timedelta(lag, unit='D')
+
+    siaran_pers = titles[sp_idx].copy()
+    unmatched = rng.random(n_articles) < 0.03
+    siaran_pers[unmatched] = [t + " (ralat)" for t in siaran_pers[unmatched]]
+
+    article_ids = pd.Series(np.arange(n_articles).astype(str))
+    media = pd.Series(media)
+    berita_df = pd.DataFrame({
+        'Judul Berita': "Berita " + article_ids + " tentang " + pd.Series(titles[sp_idx]),
+        'Tanggal': tanggal.strftime('%Y-%m-%d'),
+        'Sumber Media': media,
+        'Siaran Pers': siaran_pers,
+        'Link Berita': "https://" + media + "/berita/" + article_ids,
+    })
+    return sp_df, berita_df
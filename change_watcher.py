@@ -0,0 +1,116 @@
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Metadata file Drive v3: cukup versi dan waktu modifikasi, respons-nya kecil
+DRIVE_FILE_URL = "https://www.googleapis.com/drive/v3/files/{file_id}"
+DRIVE_MARKER_FIELDS = "version,modifiedTime"
+
+
+class DriveModificationSource:
+    """
+    Penanda modifikasi spreadsheet dari Drive API (version + modifiedTime).
+    Memakai AuthorizedSession milik SheetsClientManager, jadi token dan
+    koneksi keep-alive dipakai bersama dengan request Sheets.
+    """
+
+    def __init__(self, manager, timeout=10):
+        self.manager = manager
+        self.timeout = timeout
+
+    def marker(self):
+        response = self.manager.session.get(
+            DRIVE_FILE_URL.format(file_id=self.manager.spreadsheet_id),
+            params={"fields": DRIVE_MARKER_FIELDS},
+            timeout=self.timeout)
+        response.raise_for_status()
+        data = response.json()
+        return data.get("version"), data.get("modifiedTime")
+
+
+class FakeModificationSource:
+    """
+    Sumber penanda lokal untuk testing: panggil touch() untuk mensimulasikan
+    spreadsheet yang diedit, atau fail() supaya poll berikutnya error
+    """
+
+    def __init__(self, marker=0):
+        self._marker = marker
+        self._error = None
+        self._lock = threading.Lock()
+        self.polls = 0
+
+    def touch(self):
+        with self._lock:
+            self._marker += 1
+
+    def fail(self, error):
+        with self._lock:
+            self._error = error
+
+    def marker(self):
+        with self._lock:
+            self.polls += 1
+            if self._error is not None:
+                error, self._error = self._error, None
+                raise error
+            return self._marker
+
+
+class ChangeWatcher:
+    """
+    Thread background yang mem-poll source.marker() setiap `interval` detik
+    dan memanggil on_change() hanya kalau penandanya berubah. Poll pertama
+    hanya mencatat penanda awal. Kalau poll atau on_change gagal, error dilog
+    dan penanda lama dipertahankan sehingga dicoba lagi di poll berikutnya.
+    """
+
+    def __init__(self, source, on_change, interval=60):
+        self.source = source
+        self.on_change = on_change
+        self.interval = interval
+        self.marker = None
+        self.changes = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def poll_once(self):
+        """
+        Satu kali poll; True kalau perubahan terdeteksi dan on_change berhasil
+        """
+        marker = self.source.marker()
+        if self.marker is None:
+            self.marker = marker
+            return False
+        if marker == self.marker:
+            return False
+        logger.info("Spreadsheet berubah (%s -> %s), memuat ulang dataset", self.marker, marker)
+        self.on_change()
+        self.marker = marker
+        self.changes += 1
+        return True
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+            except Exception:
+                logger.exception("Poll perubahan spreadsheet gagal")
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="spreadsheet-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
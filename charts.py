@@ -0,0 +1,174 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objs as go
+
+from instrumentation import rows, stage
+from memo import get_memo
+
+# Jumlah figure yang disimpan di cache (LRU, dibagi semua session)
+FIGURE_CACHE_SIZE = 128
+
+# Batas titik per chart: di atasnya line/scatter dirender dengan WebGL dan
+# series line di-downsample (LTTB) ke sekitar jumlah titik ini per rentang zoom
+LARGE_SERIES_POINTS = int(os.environ.get("CHART_MAX_POINTS", 1500))
+
+
+def content_hash(data, params=None):
+    """
+    Hash isi agregat sebuah chart (DataFrame/Series kecil atau struktur JSON
+    seperti hasil build_sankey) beserta parameter layout-nya
+    """
+    digest = hashlib.sha1()
+    if isinstance(data, (pd.DataFrame, pd.Series)):
+        columns = list(data.columns) if isinstance(data, pd.DataFrame) else [data.name]
+        dtypes = data.dtypes.tolist() if isinstance(data, pd.DataFrame) else [data.dtype]
+        digest.update(repr((columns, list(map(str, dtypes)))).encode())
+        if len(data):
+            digest.update(pd.util.hash_pandas_object(data, index=True).values.tobytes())
+    else:
+        digest.update(json.dumps(data, sort_keys=True, default=str).encode())
+    digest.update(json.dumps(params or {}, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def cached_figure(name, data, build, **params):
+    """
+    Figure untuk chart `name` dari cache kalau agregat data dan params sama
+    dengan sebelumnya; kalau belum ada, build(data, **params) dipanggil.
+    Figure dipakai bersama oleh semua session, jadi jangan diubah in-place.
+    """
+    with stage(f'figure:{name}', rows_in=rows(data)) as s:
+        key = (name, content_hash(data, params))
+        return get_memo('figures', maxsize=FIGURE_CACHE_SIZE).get_or_compute(
+            key, s.track(lambda: build(data, **params)))
+
+
+def _as_float(values):
+    """
+    Nilai sumbu (angka, datetime, atau objek date) sebagai float untuk LTTB
+    """
+    values = pd.Series(values)
+    if pd.api.types.is_numeric_dtype(values):
+        return values.to_numpy(dtype=float)
+    return pd.to_datetime(values).to_numpy(dtype='datetime64[ns]').astype(np.int64).astype(float)
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Posisi titik yang dipertahankan oleh Largest-Triangle-Three-Buckets:
+    titik pertama dan terakhir selalu ikut, sisanya satu titik per bucket yang
+    membentuk segitiga terbesar dengan titik terpilih sebelumnya dan rata-rata
+    bucket berikutnya. x harus sudah urut naik.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # n_out - 2 bucket di antara titik pertama dan terakhir
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    selected = np.empty(n_out, dtype=int)
+    selected[0] = 0
+    selected[-1] = n - 1
+    previous = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        area = np.abs((x[previous] - avg_x) * (y[start:end] - y[previous])
+                      - (x[previous] - x[start:end]) * (avg_y - y[previous]))
+        previous = start + int(np.argmax(area))
+        selected[i + 1] = previous
+    return selected
+
+
+def _points_for_range(x, x_range, max_points):
+    # Resolusi mengikuti rentang zoom: max_points titik untuk rentang x_range,
+    # data di luar rentang itu mendapat titik sebanding panjangnya
+    if x_range is None:
+        return max_points
+    lo, hi = _as_float(list(x_range))
+    if hi <= lo:
+        return max_points
+    return max(int(np.ceil(max_points * (x[-1] - x[0]) / (hi - lo))), 3)
+
+
+def downsample_line(data, x, y, x_range=None, max_points=LARGE_SERIES_POINTS, color=None):
+    """
+    Downsample series line dengan LTTB (bentuk puncak/lembah dipertahankan).
+    Per warna (color) didownsample terpisah; series yang sudah kecil dikembalikan apa adanya.
+    """
+    if color is not None:
+        groups = [group for _, group in data.groupby(color, observed=True, sort=False)]
+    else:
+        groups = [data]
+
+    sampled = []
+    for group in groups:
+        if len(group) <= max_points:
+            sampled.append(group)
+            continue
+        xs = _as_float(group[x])
+        order = np.argsort(xs, kind='mergesort')
+        xs = xs[order]
+        ys = group[y].to_numpy(dtype=float)[order]
+        keep = lttb_indices(xs, ys, _points_for_range(xs, x_range, max_points))
+        sampled.append(group.iloc[order[keep]])
+    return sampled[0] if len(sampled) == 1 else pd.concat(sampled)
+
+
+def express_figure(data, kind, layout=None, traces=None, xaxes=None, x_range=None, **px_args):
+    """
+    Figure plotly.express (kind: 'bar', 'line', 'scatter', 'pie', ...) dari
+    DataFrame agregat, lalu update layout/traces/sumbu X kalau diberikan.
+
+    Line dan scatter dengan lebih dari LARGE_SERIES_POINTS titik dirender
+    dengan WebGL; series line di-downsample dengan LTTB, resolusinya mengikuti
+    x_range (rentang tanggal yang sedang dilihat).
+    """
+    if kind in ('line', 'scatter') and len(data) > LARGE_SERIES_POINTS:
+        if kind == 'line':
+            data = downsample_line(data, px_args['x'], px_args['y'], x_range,
+                                   color=px_args.get('color'))
+        px_args.setdefault('render_mode', 'webgl')
+    fig = getattr(px, kind)(data, **px_args)
+    if traces:
+        fig.update_traces(**traces)
+    if layout:
+        fig.update_layout(**layout)
+    if xaxes:
+        fig.update_xaxes(**xaxes)
+    return fig
+
+
+def sankey_figure(sankey, title, height=600, node_color=None, link_color=None, font=None):
+    """
+    Figure Plotly dari hasil analytics.build_sankey
+    """
+    node = dict(
+        pad=15,
+        thickness=20,
+        line=dict(color="black", width=0.5),
+        label=sankey['labels']
+    )
+    if node_color:
+        node['color'] = node_color
+
+    link = dict(
+        source=sankey['source'],
+        target=sankey['target'],
+        value=sankey['value']
+    )
+    if link_color:
+        link['color'] = link_color
+
+    fig = go.Figure(data=[go.Sankey(node=node, link=link)])
+    fig.update_layout(title_text=title, height=height)
+    if font:
+        fig.update_layout(font=font)
+    return fig
@@ -1,86 +1,751 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FuturesTimeout
 import pandas as pd
 import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+from gspread.utils import absolute_range_name, rowcol_to_a1
 import streamlit as st
+from change_watcher import ChangeWatcher, DriveModificationSource
+from dataset_cache import DatasetCache
+from dedup import find_duplicates
+from instrumentation import stage
+from memo import get_memo
+from schema import PARSE_ERROR_COLUMNS, SHEET_SCHEMAS, normalize_frame
+from sheets_client import SheetsClientManager
+from snapshot_store import (frame_checksum, normalized_snapshot_source,
+                            read_normalized_snapshot, read_snapshot, read_snapshot_meta,
+                            update_snapshot_meta, write_normalized_snapshot, write_snapshot)
+
+logger = logging.getLogger(__name__)
+
+# Frame dataset dipakai bersama oleh semua session: dengan copy-on-write,
+# perubahan di satu session selalu membuat salinan sendiri dan tidak pernah
+# mengubah frame di cache
+pd.set_option("mode.copy_on_write", True)
+
+# ID spreadsheet dari konfigurasi sebelumnya
+SPREADSHEET_ID = "1OrofvXQ5a-H27SR5YtrTkv4szzRRDQ6KUELGAVMWbVg"
+
+# Kolom yang benar-benar dipakai dashboard per sheet (proyeksi kolom)
+DATASET_COLUMNS = {
+    'DATASET SP': ['JUDUL', 'PUBLIKASI', 'NARASUMBER'],
+    'DATASET BERITA': ['Judul Berita', 'Tanggal', 'Sumber Media', 'Siaran Pers', 'Link Berita'],
+}
+
+# Urutan penyajian (terbaru dulu) per sheet, diterapkan sekali saat normalisasi
+SHEET_SORT_COLUMNS = {
+    'DATASET SP': 'PUBLIKASI',
+    'DATASET BERITA': 'Tanggal',
+}
+
+# Sheet yang peta duplikatnya disiapkan di background setelah setiap load
+DEDUP_SHEETS = ('DATASET BERITA',)
+
+# Sheet yang hanya bertambah di bawah (append-only): disinkronkan inkremental
+INCREMENTAL_SHEETS = ('DATASET BERITA',)
+
+# Jumlah baris terakhir snapshot yang diambil ulang untuk mendeteksi edit/hapus
+SYNC_OVERLAP_ROWS = 20
+
+# Edit di baris yang lebih lama hanya terdeteksi lewat full resync berkala
+FULL_RESYNC_SECONDS = float(os.environ.get("DATASET_FULL_RESYNC", str(6 * 3600)))
+
+# Mode offline: data hanya dari snapshot lokal, tanpa menghubungi Google Sheets
+OFFLINE_MODE = os.environ.get("DASHBOARD_OFFLINE", "0") == "1"
+
+# Konfigurasi cache dataset bersama (override lewat environment variable)
+CACHE_TTL_SECONDS = float(os.environ.get("DATASET_CACHE_TTL", "600"))
+CACHE_MAX_BYTES = int(float(os.environ.get("DATASET_CACHE_MAX_MB", "512")) * 1024 * 1024)
+
+# Batas waktu (detik) fetch per sheet; sheet yang lewat batas tidak menahan sheet lain.
+# Juga dipakai sebagai timeout setiap request HTTP ke Google Sheets.
+SHEET_TIMEOUT_SECONDS = float(os.environ.get("DATASET_SHEET_TIMEOUT", "30"))
+
+# Kalau batchGet belum selesai setelah sekian detik, setiap sheet juga diambil
+# sendiri-sendiri; hasil mana pun yang lebih dulu lengkap yang dipakai
+SHEET_HEDGE_SECONDS = float(os.environ.get("DATASET_SHEET_HEDGE", "5"))
+
+# Thread pool untuk normalisasi paralel. Fetch tidak memakai pool ini (lihat
+# _submit_fetch) supaya fetch yang macet tidak pernah menahan normalisasi.
+_normalize_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="sheet-normalize")
+
+# Peta duplikat dihitung di satu worker background (bukan di rerun user),
+# sekali per versi dataset; job untuk versi lama dibuang
+_dedup_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dedup")
+_dedup_jobs = {}
+_dedup_lock = threading.Lock()
+DEDUP_MAX_JOBS = 4
+
+# Interval (detik) poll penanda modifikasi spreadsheet; 0 = watcher tidak dijalankan
+WATCH_INTERVAL_SECONDS = float(os.environ.get("DATASET_WATCH_INTERVAL", "60"))
+
+# Satu cache per proses: semua session Streamlit memakai salinan data yang sama
+_dataset_cache = DatasetCache(ttl=CACHE_TTL_SECONDS, max_bytes=CACHE_MAX_BYTES)
+
+# Client manager Google Sheets, dibuat saat pertama kali dibutuhkan
+_sheets_manager = None
+_sheets_manager_lock = threading.Lock()
+
+# Header (baris pertama) tiap sheet, untuk memetakan nama kolom ke huruf kolom
+_header_cache = {}
+
+# Waktu terakhir data tiap sheet berhasil diambil dari Google Sheets
+_last_updated = {}
+
+# Baris yang gagal diparse per sheet (hasil normalisasi terakhir)
+_parse_errors = {}
+
+# Error load terakhir per sheet (dihapus lagi setelah sheet berhasil dimuat)
+_load_errors = {}
+
+# Watcher perubahan spreadsheet, satu per proses
+_change_watcher = None
+_change_watcher_lock = threading.Lock()
+
+class DatasetLoadError(Exception):
+    """
+    Error saat mengambil worksheet dari Google Sheets
+    """
+
+def get_sheets_manager():
+    """
+    Client manager Google Sheets bersama untuk seluruh proses.
+    Dibuat sekali; panggilan berikutnya memakai client dan session yang sama.
+    """
+    global _sheets_manager
+
+    with _sheets_manager_lock:
+        if _sheets_manager is None:
+            # Ambil kredensial dari Streamlit Secrets. Tanpa secrets.toml
+            # st.secrets melempar FileNotFoundError (dan menampilkan error),
+            # jadi keberadaan file dicek dulu tanpa efek samping.
+            try:
+                credentials_dict = (st.secrets.get("gcp_service_account")
+                                    if st.secrets.load_if_toml_exists() else None)
+            except Exception as e:
+                raise DatasetLoadError(f"Kredensial Google Cloud tidak dapat dibaca: {e}") from e
+
+            if not credentials_dict:
+                raise DatasetLoadError("Kredensial Google Cloud tidak ditemukan!")
+
+            _sheets_manager = SheetsClientManager(
+                SPREADSHEET_ID,
+                credentials_info=credentials_dict,
+                api_base_url=os.environ.get("SHEETS_API_BASE_URL"),
+                timeout=SHEET_TIMEOUT_SECONDS)
+
+        return _sheets_manager
 
 def connect_to_sheets():
     """
     Koneksi ke Google Sheets dengan error handling lebih baik
     """
     try:
-        # Ambil kredensial dari Streamlit Secrets
-        credentials_dict = st.secrets.get("gcp_service_account")
-        
-        if not credentials_dict:
-            st.error("Kredensial Google Cloud tidak ditemukan!")
-            return None, None
-        
-        # Definisikan scope
-        scope = [
-            'https://spreadsheets.google.com/feeds',
-            'https://www.googleapis.com/auth/drive'
-        ]
-        
-        # Buat kredensial
-        credentials = ServiceAccountCredentials.from_json_keyfile_dict(
-            credentials_dict, scope)
-        
-        # Authorize
-        client = gspread.authorize(credentials)
-        
-        # ID spreadsheet dari konfigurasi sebelumnya
-        spreadsheet_id = "1OrofvXQ5a-H27SR5YtrTkv4szzRRDQ6KUELGAVMWbVg"
-        
-        return client, spreadsheet_id
-    
+        return get_sheets_manager().client(), SPREADSHEET_ID
+
     except Exception as e:
         st.error(f"Kesalahan koneksi: {e}")
         return None, None
 
-def load_dataset(sheet_name):
+def _fetch_dataset(sheet_name):
+    """
+    Ambil satu worksheet dari Google Sheets sebagai DataFrame.
+    Tidak memanggil st.* supaya aman dijalankan di thread refresh background.
+    """
+    try:
+        manager = get_sheets_manager()
+    except DatasetLoadError:
+        raise
+    except Exception as e:
+        raise DatasetLoadError(f"Tidak dapat terhubung ke Google Sheets: {e}")
+
+    # Handle worksheet dipakai ulang antar load (tanpa authorize/open ulang)
+    worksheet = manager.worksheet(sheet_name)
+
+    # Ambil semua data
+    data = worksheet.get_all_values()
+
+    if not data:
+        return pd.DataFrame()
+
+    # Konversi ke DataFrame
+    headers = data[0]
+    values = data[1:]
+    return pd.DataFrame(values, columns=headers)
+
+def _column_letter(index):
+    """
+    Huruf kolom A1 untuk indeks kolom berbasis 0 (0 -> A, 26 -> AA)
+    """
+    return rowcol_to_a1(1, index + 1)[:-1]
+
+def _fetch_headers(spreadsheet, sheet_names):
     """
-    Load dataset dengan error handling komprehensif
+    Ambil baris header beberapa sheet dalam satu request batchGet
     """
+    ranges = [absolute_range_name(sheet_name, '1:1') for sheet_name in sheet_names]
+    response = spreadsheet.values_batch_get(ranges)
+    for sheet_name, value_range in zip(sheet_names, response.get('valueRanges', [])):
+        rows = value_range.get('values', [])
+        _header_cache[sheet_name] = rows[0] if rows else []
+
+def _columns_to_frame(columns, values):
+    """
+    Bangun DataFrame dari nilai per kolom (major dimension COLUMNS).
+    Sel kosong di ujung kolom tidak dikirim API, jadi dipadatkan dengan ''.
+    """
+    if not columns:
+        return pd.DataFrame()
+    n_rows = max(len(v) for v in values)
+    return pd.DataFrame(
+        {col: v + [''] * (n_rows - len(v)) for col, v in zip(columns, values)},
+        columns=columns)
+
+def _fetch_projected(keys, start_rows=None):
+    """
+    Ambil beberapa sheet dalam SATU request values.batchGet, hanya kolom yang
+    diminta. keys adalah daftar (sheet_name, (kolom, ...)); start_rows boleh
+    berisi baris sheet pertama yang diambil per key (default 2, tepat setelah
+    header) untuk sinkronisasi inkremental.
+
+    Pemetaan nama kolom ke huruf kolom memakai header yang di-cache; setiap
+    request ikut membawa header-nya sehingga kalau urutan kolom di sheet
+    berubah, header diambil ulang dan request diulang sekali.
+    """
+    start_rows = start_rows or {}
     try:
-        client, spreadsheet_id = connect_to_sheets()
-        
-        if not client:
-            st.error("Tidak dapat terhubung ke Google Sheets")
-            return pd.DataFrame()
-        
+        spreadsheet = get_sheets_manager().spreadsheet()
+    except DatasetLoadError:
+        raise
+    except Exception as e:
+        raise DatasetLoadError(f"Tidak dapat terhubung ke Google Sheets: {e}")
+
+    for _ in range(2):
+        missing_headers = [sheet_name for sheet_name, _ in keys if sheet_name not in _header_cache]
+        if missing_headers:
+            _fetch_headers(spreadsheet, missing_headers)
+
+        ranges = []
+        plan = []
+        for key in keys:
+            sheet_name, columns = key
+            headers = _header_cache[sheet_name]
+            present = [col for col in columns if col in headers]
+            start_row = start_rows.get(key, 2)
+            if start_row > 2:
+                # Range kolom tidak mencakup header, jadi header diambil terpisah
+                ranges.append(absolute_range_name(sheet_name, '1:1'))
+            for col in present:
+                letter = _column_letter(headers.index(col))
+                first_row = 1 if start_row == 2 else start_row
+                ranges.append(absolute_range_name(sheet_name, f"{letter}{first_row}:{letter}"))
+            plan.append((key, present, start_row))
+
+        response = spreadsheet.values_batch_get(ranges, params={'majorDimension': 'COLUMNS'})
+        value_ranges = response.get('valueRanges', [])
+
+        frames = {}
+        headers_match = True
+        position = 0
+        for key, present, start_row in plan:
+            if start_row > 2:
+                header_row = [c[0] if c else '' for c in value_ranges[position].get('values', [])]
+                position += 1
+                if header_row != _header_cache[key[0]]:
+                    headers_match = False
+            values = []
+            for col in present:
+                column_values = value_ranges[position].get('values', [[]])[0]
+                position += 1
+                if start_row == 2:
+                    if not column_values or column_values[0] != col:
+                        headers_match = False
+                    column_values = column_values[1:]
+                values.append(column_values)
+            frames[key] = _columns_to_frame(present, values)
+
+        if headers_match:
+            return frames
+
+        # Urutan kolom di sheet berubah: buang header lama lalu ulangi
+        for sheet_name, _ in keys:
+            _header_cache.pop(sheet_name, None)
+
+    raise DatasetLoadError("Header sheet berubah selama proses load, coba lagi")
+
+def _submit_fetch(fn, *args):
+    """
+    Jalankan fetch di thread daemon sendiri, bukan di pool: fetch yang
+    ditinggalkan karena timeout tidak menempati worker yang dibutuhkan load
+    berikutnya. Umurnya dibatasi timeout HTTP client Sheets.
+    """
+    future = Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
         try:
-            # Buka spreadsheet
-            spreadsheet = client.open_by_key(spreadsheet_id)
-            
-            # Ambil worksheet
-            worksheet = spreadsheet.worksheet(sheet_name)
-            
-            # Ambil semua data
-            data = worksheet.get_all_values()
-            
-            if not data:
-                st.warning(f"Tidak ada data di sheet {sheet_name}")
-                return pd.DataFrame()
-            
-            # Konversi ke DataFrame
-            headers = data[0]
-            values = data[1:]
-            df = pd.DataFrame(values, columns=headers)
-            
-            return df
-        
-        except gspread.exceptions.WorksheetNotFound:
-            st.error(f"Sheet {sheet_name} tidak ditemukan")
-            return pd.DataFrame()
-        
-        except Exception as e:
-            st.error(f"Kesalahan membaca sheet {sheet_name}: {e}")
-            return pd.DataFrame()
-    
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name="sheet-fetch", daemon=True).start()
+    return future
+
+def _fetch_sheets(keys, start_rows=None):
+    """
+    Ambil beberapa sheet: jalur utama tetap satu batchGet untuk semua sheet.
+    Kalau batchGet gagal atau belum selesai setelah SHEET_HEDGE_SECONDS
+    (paling lama separuh batas waktu), setiap sheet juga diambil sendiri-sendiri secara paralel sambil batchGet
+    tetap ditunggu. Semua memakai SATU batas waktu (SHEET_TIMEOUT_SECONDS
+    sejak awal), jadi total waktunya sekitar sheet yang paling lambat dan
+    sheet yang bermasalah tidak menahan atau mengosongkan sheet lain.
+
+    Mengembalikan (frames, errors): dict key -> DataFrame untuk sheet yang
+    berhasil dan dict key -> exception untuk yang gagal.
+    """
+    start_rows = start_rows or {}
+    deadline = time.monotonic() + SHEET_TIMEOUT_SECONDS
+    batch = _submit_fetch(_fetch_projected, keys, start_rows)
+    hedge = SHEET_TIMEOUT_SECONDS if len(keys) == 1 else min(SHEET_HEDGE_SECONDS, SHEET_TIMEOUT_SECONDS / 2)
+    try:
+        return batch.result(timeout=hedge), {}
+    except FuturesTimeout:
+        error = DatasetLoadError(f"Timeout {hedge:g} detik saat mengambil sheet")
     except Exception as e:
-        st.error(f"Kesalahan umum: {e}")
+        error = e
+    if len(keys) == 1:
+        return {}, {keys[0]: error}
+    logger.warning("batchGet untuk %s gagal/lambat (%s), ambil juga per sheet", [k[0] for k in keys], error)
+
+    futures = {
+        key: _submit_fetch(_fetch_projected, [key], {key: start_rows[key]} if key in start_rows else None)
+        for key in keys
+    }
+    # Tunggu sampai batchGet berhasil atau semua fetch per sheet selesai
+    pending = set(futures.values())
+    if not batch.done():
+        pending.add(batch)
+    while any(not future.done() for future in futures.values()):
+        done, pending = wait(pending, timeout=max(0, deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+        if not done:
+            break
+        if batch in done and batch.exception() is None:
+            return batch.result(), {}
+
+    frames = {}
+    errors = {}
+    for key, future in futures.items():
+        if not future.done():
+            errors[key] = DatasetLoadError(
+                f"Timeout {SHEET_TIMEOUT_SECONDS:g} detik saat mengambil sheet {key[0]}")
+        elif future.exception() is not None:
+            errors[key] = future.exception()
+        else:
+            frames.update(future.result())
+    return frames, errors
+
+def _incremental_base(key):
+    """
+    Snapshot lokal yang bisa dipakai sebagai dasar sinkronisasi inkremental,
+    atau None kalau harus full reload (belum ada snapshot, kolom berbeda,
+    atau sudah waktunya full resync berkala)
+    """
+    sheet_name, columns = key
+    snapshot, meta = read_snapshot(sheet_name)
+    if snapshot is None or meta.get("columns") != list(columns):
+        return None
+    if time.time() - meta.get("full_synced_at", 0) > FULL_RESYNC_SECONDS:
+        return None
+    return snapshot, meta
+
+def _merge_appended(snapshot, fetched, start_row):
+    """
+    Gabungkan baris baru ke snapshot. fetched berisi baris mulai start_row;
+    baris yang tumpang tindih dengan snapshot harus identik. Mengembalikan
+    None kalau ada baris lama yang diedit atau dihapus (perlu full reload).
+    """
+    start_index = start_row - 2
+    overlap = len(snapshot) - start_index
+    if list(fetched.columns) != list(snapshot.columns) or len(fetched) < overlap:
+        return None
+
+    old_tail = snapshot.iloc[start_index:].to_numpy()
+    new_head = fetched.iloc[:overlap].to_numpy()
+    if not (old_tail == new_head).all():
+        return None
+
+    appended = fetched.iloc[overlap:]
+    if appended.empty:
+        return snapshot
+    return pd.concat([snapshot, appended], ignore_index=True)
+
+def _load_sheets(keys):
+    """
+    Loader untuk cache dataset. Sheet di INCREMENTAL_SHEETS hanya mengambil
+    baris baru sejak snapshot terakhir (plus beberapa baris tumpang tindih
+    untuk mendeteksi edit/hapus); sheet lain diambil penuh. Semuanya tetap
+    dalam satu request batchGet. Kalau baris lama berubah, sheet tersebut
+    di-reload penuh.
+    """
+    bases = {}
+    start_rows = {}
+    for key in keys:
+        if key[0] in INCREMENTAL_SHEETS:
+            base = _incremental_base(key)
+            if base is not None:
+                bases[key] = base
+                start_rows[key] = max(2, len(base[0]) + 2 - SYNC_OVERLAP_ROWS)
+
+    with stage('fetch_sheets') as s:
+        frames, errors = _fetch_sheets(keys, start_rows)
+        s.rows_out = sum(len(df) for df in frames.values())
+
+    full_reload = []
+    for key, (snapshot, meta) in bases.items():
+        if key not in frames:
+            continue
+        merged = _merge_appended(snapshot, frames[key], start_rows[key])
+        if merged is None:
+            full_reload.append(key)
+        else:
+            frames[key] = merged
+
+    if full_reload:
+        with stage('fetch_sheets_full_reload') as s:
+            reloaded, reload_errors = _fetch_sheets(full_reload)
+            for key in reload_errors:
+                frames.pop(key, None)
+            frames.update(reloaded)
+            errors.update(reload_errors)
+            s.rows_out = sum(len(df) for df in reloaded.values())
+
+    # Sheet yang gagal tidak menggagalkan sheet lain; cache tetap memakai nilai lamanya
+    for key, error in errors.items():
+        logger.warning("Gagal memuat sheet %s: %s", key[0], error)
+        _load_errors[key[0]] = error
+    if not frames:
+        raise next(iter(errors.values()))
+
+    # Setiap fetch yang sukses langsung disimpan sebagai snapshot lokal
+    now = time.time()
+    checksums = {}
+    for key in frames:
+        _load_errors.pop(key[0], None)
+        meta = {"synced_at": now}
+        if key[0] in INCREMENTAL_SHEETS:
+            if key in bases and key not in full_reload:
+                meta["full_synced_at"] = bases[key][1].get("full_synced_at", 0)
+            else:
+                meta["full_synced_at"] = now
+        # Checksum dihitung sekali: untuk snapshot dan sebagai versi dataset
+        checksums[key] = frame_checksum(frames[key])
+        _persist_snapshot(key[0], frames[key], meta, checksums[key])
+        _last_updated[key[0]] = now
+
+    # Snapshot menyimpan nilai mentah; cache menyimpan hasil normalisasi.
+    # Normalisasi tiap sheet berjalan paralel di pool normalisasi.
+    normalized = {key: _normalize_pool.submit(_normalize, key[0], df, checksums[key]) for key, df in frames.items()}
+    normalized = {key: future.result() for key, future in normalized.items()}
+    # Snapshot hasil normalisasi (untuk cold start) dan peta duplikat versi
+    # baru disiapkan di background, tanpa ditunggu
+    for key, df in normalized.items():
+        _normalize_pool.submit(_persist_normalized, key[0], df, checksums[key], dataset_parse_errors(key[0]))
+        if key[0] in DEDUP_SHEETS:
+            _schedule_duplicates(df)
+    return normalized
+
+def _normalize(sheet_name, df, checksum=None):
+    """
+    Terapkan schema sheet (tanggal diparse sekali, kolom berulang jadi
+    categorical), urutkan sekali untuk penyajian, dan catat baris yang gagal
+    diparse. checksum (frame_checksum nilai mentah) dihitung kalau tidak
+    diberikan.
+    """
+    with stage(f'normalize:{sheet_name}', rows_in=len(df)) as s:
+        version = (checksum or frame_checksum(df))[:16]
+        df, parse_errors = normalize_frame(df, SHEET_SCHEMAS.get(sheet_name, {}))
+        sort_col = SHEET_SORT_COLUMNS.get(sheet_name)
+        if sort_col in df.columns:
+            df = df.sort_values(sort_col, ascending=False)
+        # Versi dataset = checksum isi; dipakai sebagai key memo di dashboard
+        df.attrs['dataset_version'] = version
+        _parse_errors[sheet_name] = parse_errors
+        s.rows_out = len(df)
+    return df
+
+def dataset_version(df):
+    """
+    Versi (checksum isi) dataset yang dikembalikan loader, atau None
+    """
+    return df.attrs.get('dataset_version')
+
+def _compute_duplicates(df):
+    with stage('dedup', rows_in=len(df)) as s:
+        duplicates = get_memo('duplicates', maxsize=DEDUP_MAX_JOBS).get_or_compute(
+            dataset_version(df), s.track(lambda: find_duplicates(df)))
+        s.rows_out = int((duplicates['duplicate_of'] >= 0).sum())
+    return duplicates
+
+def _schedule_duplicates(df):
+    """
+    Job background peta duplikat untuk versi df (dibuat sekali per versi)
+    """
+    version = dataset_version(df)
+    with _dedup_lock:
+        job = _dedup_jobs.get(version)
+        if job is None:
+            job = _dedup_jobs[version] = _dedup_pool.submit(_compute_duplicates, df)
+            while len(_dedup_jobs) > DEDUP_MAX_JOBS:
+                _dedup_jobs.pop(next(iter(_dedup_jobs)))
+    return job
+
+def dataset_duplicates(df, wait=False):
+    """
+    Peta duplikat (lihat dedup.find_duplicates) untuk frame berita dari
+    loader, dihitung di background sekali per versi dataset. Selama masih
+    dihitung hasilnya None, kecuali wait=True.
+    """
+    job = _schedule_duplicates(df)
+    if wait or job.done():
+        return job.result()
+    return None
+
+def dataset_parse_errors(sheet_name):
+    """
+    Baris sheet yang gagal diparse pada load terakhir (kolom Baris, Kolom, Nilai)
+    """
+    return _parse_errors.get(sheet_name, pd.DataFrame(columns=PARSE_ERROR_COLUMNS))
+
+def _persist_snapshot(sheet_name, df, meta, checksum):
+    """
+    Simpan snapshot setelah fetch sukses. Kalau isinya sama dengan snapshot
+    yang ada, cukup metadata-nya yang diperbarui. Gagal menulis snapshot
+    tidak menggagalkan load.
+    """
+    try:
+        old_meta = read_snapshot_meta(sheet_name)
+        if old_meta and old_meta.get("checksum") == checksum:
+            update_snapshot_meta(sheet_name, meta)
+        else:
+            write_snapshot(sheet_name, df, meta, checksum=checksum)
+    except OSError as e:
+        logger.warning("Gagal menyimpan snapshot %s: %s", sheet_name, e)
+
+def _persist_normalized(sheet_name, df, checksum, parse_errors):
+    """
+    Simpan snapshot frame hasil normalisasi (beserta baris yang gagal
+    diparse) kalau belum ada untuk checksum mentah ini. Gagal menulis tidak
+    menggagalkan load.
+    """
+    try:
+        if normalized_snapshot_source(sheet_name) == checksum:
+            return
+        extra = {"parse_errors": {col: parse_errors[col].tolist() for col in PARSE_ERROR_COLUMNS}}
+        write_normalized_snapshot(sheet_name, df, checksum, extra)
+    except OSError as e:
+        logger.warning("Gagal menyimpan snapshot normalisasi %s: %s", sheet_name, e)
+
+def _read_normalized(sheet_name, checksum):
+    """
+    Frame hasil normalisasi dari snapshot bertipe (tanpa normalisasi ulang),
+    atau None kalau snapshot tersebut belum ada untuk checksum mentah ini
+    """
+    with stage(f'read_normalized:{sheet_name}') as s:
+        df, extra = read_normalized_snapshot(sheet_name, checksum)
+        if df is None:
+            return None
+        df.attrs['dataset_version'] = checksum[:16]
+        _parse_errors[sheet_name] = pd.DataFrame(extra.get("parse_errors", {}), columns=PARSE_ERROR_COLUMNS)
+        s.rows_out = len(df)
+    return df
+
+def _seed_from_snapshots(keys):
+    """
+    Cold start: isi cache dari snapshot lokal (memory-mapped) supaya dashboard
+    langsung tampil dengan data terakhir. Yang dibaca snapshot hasil
+    normalisasi (kolom sudah bertipe); snapshot mentah hanya dibaca dan
+    dinormalisasi kalau snapshot tersebut belum ada. Entry snapshot dianggap
+    basi, jadi refresh dari Google Sheets berjalan di background.
+    """
+    for key in keys:
+        if _dataset_cache.contains(key):
+            continue
+        meta = read_snapshot_meta(key[0])
+        if meta is None or meta.get("columns") != list(key[1]):
+            continue
+        # Versi diambil dari checksum di metadata, tanpa meng-hash ulang snapshot
+        checksum = meta.get("checksum")
+        if not checksum:
+            continue
+        normalized = _read_normalized(key[0], checksum)
+        if normalized is None:
+            snapshot, meta = read_snapshot(key[0])
+            if snapshot is None:
+                continue
+            normalized = _normalize(key[0], snapshot, checksum)
+            _normalize_pool.submit(_persist_normalized, key[0], normalized, checksum,
+                                   dataset_parse_errors(key[0]))
+        synced_at = meta.get("synced_at", 0)
+        if _dataset_cache.seed(key, normalized, synced_at, _load_sheets):
+            _last_updated[key[0]] = synced_at
+
+def dataset_last_updated(sheet_name):
+    """
+    Waktu (epoch detik) data sheet terakhir berhasil diambil dari Google
+    Sheets, atau None kalau belum pernah
+    """
+    return _last_updated.get(sheet_name)
+
+def load_datasets(sheet_columns=None, offline=None):
+    """
+    Load beberapa sheet sekaligus dengan satu request batchGet, hanya kolom
+    yang dideklarasikan (default DATASET_COLUMNS). Mengembalikan dict
+    {nama_sheet: DataFrame}.
+
+    Frame yang dikembalikan adalah salinan dangkal dari frame di cache
+    (copy-on-write): membacanya tidak menyalin data, mengubahnya hanya
+    mengubah salinan milik pemanggil.
+
+    Saat cold start data langsung disajikan dari snapshot lokal. Dengan
+    offline=True (default dari DASHBOARD_OFFLINE) data hanya diambil dari
+    cache/snapshot, tanpa menghubungi Google Sheets.
+    """
+    sheet_columns = sheet_columns or DATASET_COLUMNS
+    if offline is None:
+        offline = OFFLINE_MODE
+    keys = {sheet_name: (sheet_name, tuple(columns)) for sheet_name, columns in sheet_columns.items()}
+
+    _seed_from_snapshots(keys.values())
+
+    if offline:
+        datasets = {}
+        for sheet_name, key in keys.items():
+            df = _dataset_cache.peek(key)
+            if df is None:
+                st.error(f"Snapshot untuk sheet {sheet_name} belum tersedia (mode offline)")
+                df = pd.DataFrame()
+            datasets[sheet_name] = df.copy(deep=False)
+        return datasets
+
+    try:
+        with stage('load_datasets') as s:
+            # Hit kalau semua sheet sudah ada di cache (basi pun tetap disajikan)
+            s.cache = 'hit' if all(_dataset_cache.contains(key) for key in keys.values()) else 'miss'
+            frames = _dataset_cache.get_many(list(keys.values()), _load_sheets)
+            s.rows_out = sum(len(df) for df in frames.values())
+
+    except DatasetLoadError as e:
+        st.error(str(e))
+        return {sheet_name: pd.DataFrame() for sheet_name in keys}
+
+    except Exception as e:
+        st.error(f"Kesalahan membaca sheet {', '.join(keys)}: {e}")
+        return {sheet_name: pd.DataFrame() for sheet_name in keys}
+
+    datasets = {}
+    for sheet_name, key in keys.items():
+        df = frames.get(key)
+        if df is None:
+            # Sheet ini gagal dimuat dan belum pernah ada di cache
+            st.error(f"Kesalahan membaca sheet {sheet_name}: {_load_errors.get(sheet_name)}")
+            df = pd.DataFrame()
+        elif sheet_name in _load_errors:
+            st.warning(f"Sheet {sheet_name} gagal diperbarui ({_load_errors[sheet_name]}), "
+                       "menampilkan data terakhir")
+        if df.empty:
+            st.warning(f"Tidak ada data di sheet {sheet_name}")
+        datasets[sheet_name] = df.copy(deep=False)
+    return datasets
+
+def load_dataset(sheet_name):
+    """
+    Load dataset lewat cache bersama (TTL + stale-while-revalidate),
+    dengan error handling komprehensif
+    """
+    try:
+        df = _dataset_cache.get(sheet_name, lambda: _normalize(sheet_name, _fetch_dataset(sheet_name)))
+
+        if df.empty:
+            st.warning(f"Tidak ada data di sheet {sheet_name}")
+
+        return df
+
+    except gspread.exceptions.WorksheetNotFound:
+        st.error(f"Sheet {sheet_name} tidak ditemukan")
         return pd.DataFrame()
 
+    except DatasetLoadError as e:
+        st.error(str(e))
+        return pd.DataFrame()
+
+    except Exception as e:
+        st.error(f"Kesalahan membaca sheet {sheet_name}: {e}")
+        return pd.DataFrame()
+
+def refresh_datasets(sheet_names=None):
+    """
+    Paksa reload dataset yang sudah ada di cache ("refresh now").
+    Kalau refresh gagal, data lama tetap dipakai dan error ditampilkan.
+    """
+    keys = None
+    if sheet_names is not None:
+        # Key cache berupa nama sheet atau (nama sheet, kolom)
+        keys = [key for key in _dataset_cache.info()
+                if (key[0] if isinstance(key, tuple) else key) in sheet_names]
+    errors = _dataset_cache.refresh(keys)
+    for key, e in errors.items():
+        sheet_name = key[0] if isinstance(key, tuple) else key
+        st.error(f"Gagal refresh sheet {sheet_name}: {_load_errors.get(sheet_name, e)}")
+
+def _refresh_on_change():
+    """
+    Dipanggil watcher saat spreadsheet berubah: reload semua dataset di cache.
+    Entry baru menggantikan yang lama sekaligus, jadi session melihat versi
+    baru di rerun berikutnya. Error membuat watcher mencoba lagi nanti.
+    """
+    errors = _dataset_cache.refresh()
+    if errors:
+        raise DatasetLoadError(f"Refresh setelah perubahan gagal untuk {[k[0] for k in errors]}")
+
+def start_change_watcher(source=None, interval=None):
+    """
+    Jalankan (sekali per proses) thread yang mem-poll penanda modifikasi
+    spreadsheet dan me-reload dataset hanya kalau penandanya berubah.
+    source default-nya Drive API lewat session client Sheets; untuk testing
+    bisa diganti change_watcher.FakeModificationSource. Mengembalikan watcher,
+    atau None kalau dimatikan (interval 0).
+    """
+    global _change_watcher
+    interval = WATCH_INTERVAL_SECONDS if interval is None else interval
+    if interval <= 0:
+        return None
+    with _change_watcher_lock:
+        if _change_watcher is None:
+            if source is None:
+                source = DriveModificationSource(get_sheets_manager())
+            _change_watcher = ChangeWatcher(source, _refresh_on_change, interval).start()
+        return _change_watcher
+
+def stop_change_watcher():
+    """
+    Hentikan watcher (mis. di akhir test)
+    """
+    global _change_watcher
+    with _change_watcher_lock:
+        if _change_watcher is not None:
+            _change_watcher.stop()
+            _change_watcher = None
+
+def dataset_cache_info():
+    """
+    Status cache dataset (umur, ukuran, sedang refresh atau tidak)
+    """
+    return _dataset_cache.info()
+
 def safe_convert_date(date_str):
     """
     Konversi tanggal dengan robust error handling
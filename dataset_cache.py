@@ -0,0 +1,266 @@
+import logging
+import sys
+import threading
+import time
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_nbytes(value):
+    """
+    Perkiraan ukuran memori sebuah nilai cache (DataFrame dihitung deep)
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, dict):
+        return sum(estimate_nbytes(v) for v in value.values())
+    return sys.getsizeof(value)
+
+
+class _MultiLock:
+    """
+    Context manager untuk memegang beberapa lock sekaligus
+    """
+
+    def __init__(self, locks):
+        self.locks = locks
+
+    def __enter__(self):
+        for lock in self.locks:
+            lock.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        for lock in reversed(self.locks):
+            lock.release()
+
+
+class CacheEntry:
+    """
+    Satu item di DatasetCache beserta metadata umurnya
+    """
+    __slots__ = ("value", "loader", "loaded_at", "last_access", "nbytes")
+
+    def __init__(self, value, loader):
+        self.value = value
+        self.loader = loader
+        self.loaded_at = time.time()
+        self.last_access = self.loaded_at
+        self.nbytes = estimate_nbytes(value)
+
+    @property
+    def age(self):
+        return time.time() - self.loaded_at
+
+
+class DatasetCache:
+    """
+    Cache dataset yang dibagi oleh semua session dalam satu proses.
+
+    - ttl: umur (detik) sebelum entry dianggap basi
+    - max_bytes: batas memori total, entry paling lama tidak diakses dibuang duluan
+    - max_stale: umur maksimum entry basi yang masih boleh disajikan sambil
+      di-refresh di background (None = selalu sajikan data lama)
+    """
+
+    def __init__(self, ttl=600, max_bytes=512 * 1024 * 1024, max_stale=None):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_stale = max_stale
+        self._entries = {}
+        self._lock = threading.RLock()
+        self._key_locks = {}
+        self._refreshing = set()
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def get(self, key, loader):
+        """
+        Ambil nilai untuk satu key; loader() tanpa argumen mengembalikan nilainya
+        """
+        return self.get_many([key], lambda keys: {key: loader()})[key]
+
+    def get_many(self, keys, loader):
+        """
+        Ambil nilai untuk beberapa key sekaligus. loader(keys) menerima daftar
+        key yang perlu dimuat dan mengembalikan dict {key: nilai}, sehingga
+        beberapa key bisa diambil dalam satu request. Loader boleh melewatkan
+        key yang gagal dimuat; key itu tidak ada di hasil kecuali masih punya
+        nilai lama.
+
+        Key yang belum ada dimuat sinkron (hanya sekali walaupun banyak session
+        meminta bersamaan). Key yang sudah basi dikembalikan nilai lamanya dan
+        di-refresh di background (stale-while-revalidate).
+        """
+        result = {}
+        missing = []
+        stale = []
+        with self._lock:
+            now = time.time()
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    missing.append(key)
+                    continue
+                entry.last_access = now
+                if entry.age <= self.ttl:
+                    result[key] = entry.value
+                elif self.max_stale is None or entry.age <= self.max_stale:
+                    result[key] = entry.value
+                    stale.append(key)
+                else:
+                    missing.append(key)
+            self._refresh_in_background(stale, loader)
+
+        if missing:
+            with self._key_locks_for(missing):
+                # Bisa jadi session lain sudah memuat key ini selagi kita menunggu
+                with self._lock:
+                    pending = []
+                    for key in missing:
+                        entry = self._entries.get(key)
+                        if entry is not None and entry.age <= self.ttl:
+                            result[key] = entry.value
+                        else:
+                            pending.append(key)
+                if pending:
+                    values = loader(pending)
+                    self._store_many(values, loader)
+                    result.update(values)
+                    # Key yang tidak dikembalikan loader (gagal dimuat): pakai
+                    # nilai lama kalau ada, selain itu tidak ada di hasil
+                    with self._lock:
+                        for key in pending:
+                            if key not in values and key in self._entries:
+                                result[key] = self._entries[key].value
+        return result
+
+    def _key_locks_for(self, keys):
+        # Kunci selalu diambil dengan urutan yang sama supaya tidak deadlock
+        return _MultiLock([self._key_lock(k) for k in sorted(set(keys), key=repr)])
+
+    def _refresh_in_background(self, keys, loader):
+        # Dipanggil dengan self._lock sudah dipegang
+        keys = [k for k in keys if k not in self._refreshing]
+        if not keys:
+            return
+        self._refreshing.update(keys)
+        thread = threading.Thread(
+            target=self._background_refresh, args=(keys, loader),
+            name=f"dataset-refresh-{keys[0]}", daemon=True)
+        thread.start()
+
+    def _background_refresh(self, keys, loader):
+        try:
+            with self._key_locks_for(keys):
+                self._store_many(loader(keys), loader)
+        except Exception:
+            # Data lama tetap disajikan, refresh dicoba lagi di request berikutnya
+            logger.exception("Refresh background untuk %s gagal", keys)
+        finally:
+            with self._lock:
+                self._refreshing.difference_update(keys)
+
+    def _store_many(self, values, loader):
+        entries = {key: CacheEntry(value, loader) for key, value in values.items()}
+        with self._lock:
+            self._entries.update(entries)
+            self._evict(keep=entries.keys())
+
+    def _evict(self, keep=()):
+        total = sum(e.nbytes for e in self._entries.values())
+        if total <= self.max_bytes:
+            return
+        # Buang entry yang paling lama tidak diakses sampai di bawah batas
+        for key, entry in sorted(self._entries.items(), key=lambda kv: kv[1].last_access):
+            if key in keep:
+                continue
+            del self._entries[key]
+            total -= entry.nbytes
+            logger.info("Evict %s dari cache dataset (%d bytes)", key, entry.nbytes)
+            if total <= self.max_bytes:
+                break
+
+    def refresh(self, keys=None):
+        """
+        Reload sinkron ("refresh now") untuk key tertentu atau semua key.
+        Key yang dimuat oleh loader yang sama di-refresh bersama dalam satu
+        panggilan. Entry yang gagal tetap memakai nilai lama; error dikembalikan.
+        """
+        groups = {}
+        with self._lock:
+            for key, entry in self._entries.items():
+                if keys is None or key in keys:
+                    groups.setdefault(id(entry.loader), (entry.loader, []))[1].append(key)
+        errors = {}
+        for loader, group_keys in groups.values():
+            try:
+                with self._key_locks_for(group_keys):
+                    values = loader(group_keys)
+                    self._store_many(values, loader)
+            except Exception as e:
+                for key in group_keys:
+                    errors[key] = e
+                continue
+            for key in group_keys:
+                if key not in values:
+                    errors[key] = KeyError(f"{key} tidak dimuat")
+        return errors
+
+    def seed(self, key, value, loaded_at, loader):
+        """
+        Isi cache dengan nilai yang sudah ada (mis. dari snapshot di disk)
+        beserta waktu pengambilannya, hanya kalau key belum ada. Entry yang
+        sudah basi akan di-refresh di background pada get berikutnya.
+        """
+        with self._lock:
+            if key in self._entries:
+                return False
+            entry = CacheEntry(value, loader)
+            entry.loaded_at = loaded_at
+            self._entries[key] = entry
+            self._evict(keep=(key,))
+            return True
+
+    def contains(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def peek(self, key):
+        """
+        Nilai yang tersimpan untuk key (basi atau tidak) tanpa memicu load
+        atau refresh; None kalau belum ada
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return None if entry is None else entry.value
+
+    def invalidate(self, keys=None):
+        """
+        Hapus entry sehingga request berikutnya memuat ulang secara sinkron
+        """
+        with self._lock:
+            if keys is None:
+                self._entries.clear()
+            else:
+                for key in keys:
+                    self._entries.pop(key, None)
+
+    def info(self):
+        """
+        Ringkasan isi cache: umur, ukuran, dan status refresh tiap key
+        """
+        with self._lock:
+            return {
+                key: {
+                    "age": entry.age,
+                    "nbytes": entry.nbytes,
+                    "stale": entry.age > self.ttl,
+                    "refreshing": key in self._refreshing,
+                }
+                for key, entry in self._entries.items()
+            }
@@ -0,0 +1,266 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from search_index import tokenize
+
+# Parameter query pelacak yang tidak mengubah artikel yang dituju
+TRACKING_PARAMS = re.compile(r'(?:^|&)(?:utm_[^=&]*|fbclid|gclid|amp)(?:=[^&]*)?(?=&|$)', re.IGNORECASE)
+
+# MinHash judul dengan LSH banding: LSH_BANDS band x LSH_ROWS fungsi hash.
+# Dua judul dengan Jaccard token 0.85 hampir pasti (>99%) berbagi minimal
+# satu band, judul dengan Jaccard 0.3 jarang (~6%) jadi kandidat
+LSH_BANDS = 8
+LSH_ROWS = 4
+
+# Dalam satu bucket band, setiap judul dibandingkan dengan LSH_WINDOW
+# tetangga berikutnya (bucket besar tidak menjadi kuadratik)
+LSH_WINDOW = 4
+
+# Kandidat dari LSH diverifikasi dengan Jaccard himpunan token judul
+MIN_TITLE_JACCARD = 0.85
+
+# Judul yang terlalu pendek tidak cukup informatif untuk near-duplicate
+MIN_TITLE_TOKENS = 4
+
+# Token per blok saat menghitung MinHash (membatasi memori matriks hash)
+MINHASH_CHUNK = 100000
+
+# Fungsi hash MinHash: xor lalu kali konstanta ganjil (mod 2^64), seed tetap
+# supaya hasilnya sama di setiap proses
+_rng = np.random.default_rng(20240101)
+_XORS = _rng.integers(0, 2 ** 63, LSH_BANDS * LSH_ROWS, dtype=np.uint64)
+_MULTIPLIERS = _rng.integers(0, 2 ** 62, LSH_BANDS * LSH_ROWS, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+_KEY_PRIME = np.uint64(1099511628211)
+
+
+def normalize_links(links):
+    """
+    Bentuk kanonik link berita (per elemen): tanpa skema, "www.", parameter
+    pelacak (utm_*, fbclid, ...), fragment dan garis miring di akhir path;
+    host huruf kecil. Link kosong menjadi NaN.
+    """
+    links = pd.Series(links, dtype=object).str.strip()
+    stripped = (links.str.replace(r'#.*$', '', regex=True)
+                .str.replace(r'^(?:[a-z][a-z0-9+.\-]*:)?//', '', regex=True, flags=re.IGNORECASE))
+    parts = stripped.str.extract(r'^([^/?]*)([^?]*)\??(.*)$')
+    host = parts[0].str.lower().str.replace(r'^www\.', '', regex=True)
+    query = parts[2].str.replace(TRACKING_PARAMS, '', regex=True).str.strip('&')
+    normalized = host + parts[1].str.rstrip('/') + ('?' + query).where(query != '', '')
+    return normalized.where(links.notna() & (links != ''))
+
+
+def token_hashes(token_lists):
+    """
+    Hash uint64 semua token (berurutan per judul) dan offset awal tiap judul
+    """
+    lengths = np.array([len(tokens) for tokens in token_lists], dtype=np.intp)
+    features = np.array([token for tokens in token_lists for token in tokens], dtype=object)
+    hashes = pd.util.hash_array(features) if len(features) else np.empty(0, dtype=np.uint64)
+    return hashes, np.concatenate([[0], np.cumsum(lengths)])
+
+
+def minhash(hashes, offsets, functions):
+    """
+    Signature MinHash (n_judul x jumlah fungsi, uint64) dari hasil
+    token_hashes untuk fungsi hash di `functions` (slice). Setiap judul harus
+    punya minimal satu token.
+    """
+    xors, multipliers = _XORS[functions], _MULTIPLIERS[functions]
+    n_titles = len(offsets) - 1
+    signatures = np.empty((n_titles, len(xors)), dtype=np.uint64)
+    # Judul diproses per blok supaya matriks token x fungsi hash tetap kecil
+    start = 0
+    while start < n_titles:
+        stop = max(start + 1, np.searchsorted(offsets, offsets[start] + MINHASH_CHUNK, side='right') - 1)
+        values = (hashes[offsets[start]:offsets[stop], None] ^ xors) * multipliers
+        signatures[start:stop] = np.minimum.reduceat(values, offsets[start:stop] - offsets[start], axis=0)
+        start = stop
+    return signatures
+
+
+def _band_keys(signatures):
+    """
+    Satu key uint64 per baris dari kolom-kolom signature satu band
+    """
+    keys = np.zeros(len(signatures), dtype=np.uint64)
+    for column in signatures.T:
+        keys = (keys * _KEY_PRIME) ^ column
+    return keys
+
+
+def connected_components(n, edges):
+    """
+    Label komponen (posisi terkecil di komponennya) untuk n simpul dan array
+    edge (m x 2): propagasi label minimum + pointer jumping, tanpa loop Python
+    per edge
+    """
+    labels = np.arange(n)
+    left, right = edges[:, 0], edges[:, 1]
+    while True:
+        low = np.minimum(labels[left], labels[right])
+        updated = labels.copy()
+        np.minimum.at(updated, left, low)
+        np.minimum.at(updated, right, low)
+        # Label selalu posisi di komponen yang sama dan <= posisi sendiri
+        updated = updated[updated]
+        if (updated == labels).all():
+            return labels
+        labels = updated
+
+
+def _group_edges(codes, positions):
+    """
+    Edge dari setiap anggota group ke anggota pertamanya
+    """
+    _, first, inverse = np.unique(codes, return_index=True, return_inverse=True)
+    return np.column_stack([positions, positions[first][inverse]])
+
+
+def _is_near_duplicate(shared, left_sizes, right_sizes):
+    """
+    Jaccard >= MIN_TITLE_JACCARD dari jumlah token bersama dan ukuran kedua
+    himpunan: |A & B| >= J * (|A| + |B|) / (1 + J)
+    """
+    return shared >= MIN_TITLE_JACCARD * (left_sizes + right_sizes) / (1 + MIN_TITLE_JACCARD)
+
+
+def _group_keepers(roots, rank):
+    """
+    Wakil setiap baris: anggota kelompoknya dengan rank terkecil
+    """
+    order = np.argsort(rank)
+    unique_roots, first = np.unique(roots[order], return_index=True)
+    keeper_of_root = np.empty(len(roots), dtype=np.intp)
+    keeper_of_root[unique_roots] = order[first]
+    return keeper_of_root[roots]
+
+
+def _attach_near_duplicates(roots, keeper, title_edges, rank, title_codes, token_sets, sizes):
+    """
+    Gabungkan kelompok lewat edge judul mirip tanpa transitivitas. Kelompok
+    diproses urut wakilnya; sebuah kelompok ikut kelompok lebih awal yang
+    belum ikut kelompok lain, asalkan judul kedua wakilnya mirip. Jadi
+    setiap judul yang digabung mirip dengan judul wakil kelompok akhirnya.
+    Loop Python hanya berjalan atas edge judul (sedikit).
+    """
+    left, right = roots[title_edges[:, 0]], roots[title_edges[:, 1]]
+    different = left != right
+    left, right = left[different], right[different]
+    # Orientasi: (kelompok yang wakilnya lebih awal, kelompok yang lebih akhir)
+    swap = rank[keeper[left]] > rank[keeper[right]]
+    earlier, later = np.where(swap, right, left), np.where(swap, left, right)
+    order = np.lexsort((rank[keeper[earlier]], rank[keeper[later]]))
+
+    merged = {}
+    for group, center in zip(later[order], earlier[order]):
+        if group in merged or center in merged:
+            continue
+        a, b = title_codes[keeper[group]], title_codes[keeper[center]]
+        if a >= 0 and b >= 0 and _is_near_duplicate(len(token_sets[a] & token_sets[b]), sizes[a], sizes[b]):
+            merged[group] = center
+    if not merged:
+        return roots
+    root_map = np.arange(len(roots))
+    root_map[list(merged)] = list(merged.values())
+    return root_map[roots]
+
+
+def find_duplicates(berita_df):
+    """
+    Peta duplikat berita, index sama dengan berita_df:
+    - duplicate_of: posisi baris yang dipertahankan (-1 kalau baris ini
+      sendiri yang dipertahankan)
+    - Alasan: 'Link' (link ternormalisasi sama) atau 'Judul' (judul sama
+      atau hampir sama untuk siaran pers yang sama), None kalau bukan duplikat
+
+    Dalam satu kelompok duplikat yang dipertahankan adalah berita paling awal
+    (Tanggal, lalu posisi). Link dikelompokkan lewat hash table (factorize);
+    judul lewat MinHash + LSH banding dengan kandidat diverifikasi Jaccard
+    token. Keduanya linear terhadap jumlah baris. Kelompok link bersifat
+    transitif, judul mirip tidak: judul duplikat selalu mirip dengan judul
+    wakil kelompoknya.
+    """
+    n = len(berita_df)
+    positions = np.arange(n)
+
+    # Duplikat persis: link ternormalisasi sama. Normalisasi sekali per link unik.
+    link_codes, link_uniques = pd.factorize(berita_df['Link Berita'].astype(object))
+    normalized_codes, _ = pd.factorize(normalize_links(link_uniques))
+    link_codes = np.where(link_codes >= 0, normalized_codes[link_codes], -1)
+    has_link = link_codes >= 0
+    edges = [_group_edges(link_codes[has_link], positions[has_link])]
+
+    # Near-duplicate judul, hanya dalam siaran pers yang sama. Baris dengan
+    # judul dan siaran pers yang persis sama digabung lewat kombinasi unik;
+    # LSH hanya berjalan di kombinasi unik tersebut.
+    title_codes, title_uniques = pd.factorize(berita_df['Judul Berita'].astype(object))
+    token_sets = [frozenset(tokenize(title)) for title in title_uniques]
+    eligible_titles = np.array([len(tokens) >= MIN_TITLE_TOKENS for tokens in token_sets], dtype=bool)
+    sp_codes, sp_uniques = pd.factorize(berita_df['Siaran Pers'].astype(object))
+    eligible = (title_codes >= 0) & eligible_titles[np.maximum(title_codes, 0)]
+
+    combo_codes, _ = pd.factorize(
+        title_codes[eligible].astype(np.int64) * (len(sp_uniques) + 1) + sp_codes[eligible])
+    edges.append(_group_edges(combo_codes, positions[eligible]))
+    _, first = np.unique(combo_codes, return_index=True)
+    combo_rows = positions[eligible][first]
+    combo_titles = title_codes[combo_rows]
+    combo_sp = sp_codes[combo_rows]
+
+    sizes = np.array([len(tokens) for tokens in token_sets], dtype=np.intp)
+    title_ids = np.flatnonzero(eligible_titles)
+    hashes, offsets = token_hashes([sorted(token_sets[i]) for i in title_ids])
+    title_slot = np.full(len(title_uniques), -1)
+    title_slot[title_ids] = np.arange(len(title_ids))
+    candidates = []
+    for band in range(LSH_BANDS if len(combo_rows) > 1 else 0):
+        signatures = minhash(hashes, offsets, slice(band * LSH_ROWS, (band + 1) * LSH_ROWS))
+        keys = _band_keys(signatures)[title_slot[combo_titles]]
+        # Kandidat: kombinasi dalam jarak LSH_WINDOW di urutan (key band,
+        # siaran pers) yang berbagi key dan siaran pers
+        order = np.lexsort((combo_sp, keys))
+        for step in range(1, LSH_WINDOW + 1):
+            left, right = order[:-step], order[step:]
+            same_bucket = (keys[left] == keys[right]) & (combo_sp[left] == combo_sp[right])
+            candidates.append(np.column_stack([left[same_bucket], right[same_bucket]]))
+    title_edges = np.empty((0, 2), dtype=np.intp)
+    if candidates:
+        pairs = np.sort(np.concatenate(candidates), axis=1).astype(np.int64)
+        pair_keys = np.unique(pairs[:, 0] * len(combo_rows) + pairs[:, 1])
+        left, right = combo_titles[pair_keys // len(combo_rows)], combo_titles[pair_keys % len(combo_rows)]
+        shared = np.fromiter((len(token_sets[i] & token_sets[j]) for i, j in zip(left, right)),
+                             dtype=np.intp, count=len(left))
+        verified = _is_near_duplicate(shared, sizes[left], sizes[right])
+        title_edges = np.column_stack([combo_rows[pair_keys[verified] // len(combo_rows)],
+                                       combo_rows[pair_keys[verified] % len(combo_rows)]])
+
+    # Wakil kelompok: berita paling awal (NaT di akhir), lalu posisi terkecil
+    tanggal = berita_df['Tanggal'].to_numpy()
+    rank = np.empty(n, dtype=np.intp)
+    rank[np.lexsort((positions, pd.isna(tanggal), tanggal))] = positions
+
+    # Link sama dan judul persis sama digabung transitif; judul yang hanya
+    # mirip digabung lewat wakil kelompok (tidak berantai, lihat
+    # _attach_near_duplicates)
+    roots = connected_components(n, np.concatenate(edges).reshape(-1, 2))
+    keeper = _group_keepers(roots, rank)
+    if len(title_edges):
+        roots = _attach_near_duplicates(roots, keeper, title_edges, rank, title_codes, token_sets, sizes)
+        keeper = _group_keepers(roots, rank)
+
+    duplicate = keeper != positions
+    same_link = has_link & (link_codes == link_codes[keeper])
+    return pd.DataFrame({
+        'duplicate_of': np.where(duplicate, keeper, -1),
+        'Alasan': np.where(duplicate, np.where(same_link, 'Link', 'Judul'), None),
+    }, index=berita_df.index)
+
+
+def kept_positions(duplicates):
+    """
+    Posisi baris yang bukan duplikat, untuk df.iloc pada frame yang dipakai
+    find_duplicates (atau frame turunannya dengan urutan baris yang sama)
+    """
+    return np.flatnonzero(duplicates['duplicate_of'].to_numpy() < 0)
@@ -0,0 +1,133 @@
+import contextlib
+import cProfile
+import io
+import json
+import logging
+import pstats
+import threading
+import time
+
+import pandas as pd
+
+# Log terstruktur (satu JSON per tahap); aktifkan dengan level INFO
+logger = logging.getLogger("dashboard.stages")
+
+# Rekaman per thread: Streamlit menjalankan setiap rerun session di thread-nya sendiri
+_local = threading.local()
+
+
+def rows(value):
+    """
+    Jumlah baris DataFrame/Series/array, atau None untuk nilai lain
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return len(value)
+    if hasattr(value, '__len__') and not isinstance(value, (str, dict)):
+        return len(value)
+    return None
+
+
+class StageRecord:
+    """
+    Hasil pengukuran satu tahap: waktu wall, baris masuk/keluar, dan status
+    cache ('hit'/'miss', None kalau tahap tidak memakai cache)
+    """
+    __slots__ = ("name", "depth", "seconds", "rows_in", "rows_out", "cache", "_tracked")
+
+    def __init__(self, name, depth, rows_in=None):
+        self.name = name
+        self.depth = depth
+        self.seconds = None
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.cache = None
+        self._tracked = False
+
+    def track(self, compute):
+        """
+        Bungkus fungsi compute memo/cache: kalau dipanggil berarti miss,
+        kalau tidak dipanggil sampai tahap selesai berarti hit
+        """
+        self._tracked = True
+
+        def wrapped(*args, **kwargs):
+            self.cache = 'miss'
+            return compute(*args, **kwargs)
+        return wrapped
+
+    def as_dict(self):
+        return {
+            'stage': self.name,
+            'depth': self.depth,
+            'ms': None if self.seconds is None else round(self.seconds * 1000, 2),
+            'rows_in': self.rows_in,
+            'rows_out': self.rows_out,
+            'cache': self.cache,
+        }
+
+
+def start_run():
+    """
+    Mulai rekaman tahap baru untuk rerun di thread ini
+    """
+    _local.records = []
+    _local.depth = 0
+
+
+def run_records():
+    """
+    Tahap yang sudah direkam di rerun ini (urut selesai), sebagai list of dict
+    """
+    return [record.as_dict() for record in getattr(_local, 'records', [])]
+
+
+@contextlib.contextmanager
+def stage(name, rows_in=None):
+    """
+    Ukur satu tahap bernama:
+
+        with stage('filter_sp', rows_in=len(sp_df)) as s:
+            filtered = ...
+            s.rows_out = len(filtered)
+
+    Rekaman masuk ke rerun yang sedang berjalan (kalau ada) dan dilog sebagai JSON.
+    """
+    depth = getattr(_local, 'depth', 0)
+    record = StageRecord(name, depth, rows_in)
+    _local.depth = depth + 1
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record.seconds = time.perf_counter() - start
+        _local.depth = depth
+        if record._tracked and record.cache is None:
+            record.cache = 'hit'
+        records = getattr(_local, 'records', None)
+        if records is not None:
+            records.append(record)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps(record.as_dict()))
+
+
+class RunProfile:
+    """
+    Capture cProfile opsional untuk satu rerun
+    """
+
+    def __init__(self):
+        self.profiler = cProfile.Profile()
+
+    def start(self):
+        self.profiler.enable()
+
+    def stop(self):
+        self.profiler.disable()
+
+    def report(self, limit=30, sort='cumulative'):
+        """
+        Teks pstats fungsi teratas (default diurutkan cumulative time)
+        """
+        buffer = io.StringIO()
+        pstats.Stats(self.profiler, stream=buffer).sort_stats(sort).print_stats(limit)
+        return buffer.getvalue()
@@ -0,0 +1,76 @@
+import threading
+from collections import OrderedDict
+
+# Semua memo bernama dalam proses ini (dibagi oleh semua session Streamlit)
+_memos = {}
+_memos_lock = threading.Lock()
+
+
+class LRUMemo:
+    """
+    Memo hasil komputasi dengan batas jumlah entry (LRU) dan hitungan hit/miss.
+    Key harus hashable dan sudah mencakup semua yang mempengaruhi hasil
+    (mis. versi dataset dan state filter).
+    """
+
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        """
+        Kembalikan hasil untuk key; compute() hanya dipanggil kalau belum ada
+        """
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+
+        value = compute()
+
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+def get_memo(name, maxsize=64):
+    """
+    Memo bernama yang dibuat sekali per proses. Dipakai dari app.py yang
+    dieksekusi ulang di setiap rerun, sehingga instance-nya harus disimpan di
+    modul yang hanya di-import sekali.
+    """
+    with _memos_lock:
+        memo = _memos.get(name)
+        if memo is None:
+            memo = _memos[name] = LRUMemo(maxsize)
+        return memo
+
+
+def memo_stats():
+    """
+    Statistik semua memo bernama: ukuran dan hit/miss
+    """
+    with _memos_lock:
+        memos = dict(_memos)
+    return {name: memo.stats() for name, memo in memos.items()}
@@ -0,0 +1,118 @@
+import io
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from memo import get_memo
+
+# Pilihan jumlah baris per halaman tabel
+PAGE_SIZES = [25, 50, 100, 250]
+
+# Export CSV ditulis per potongan baris ini supaya tidak membuat satu string raksasa
+EXPORT_CHUNK_ROWS = 50_000
+
+
+def search_mask(series, term):
+    """
+    Mask baris yang nilainya mengandung term (tidak case-sensitive).
+    Kolom categorical dicocokkan per kategori, bukan per baris; kolom
+    datetime dicocokkan dengan format YYYY-MM-DD.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        matched = series.cat.categories.astype(str).str.contains(term, case=False, regex=False)
+        return series.isin(series.cat.categories[matched]).to_numpy()
+    if pd.api.types.is_datetime64_any_dtype(series):
+        series = series.dt.strftime('%Y-%m-%d')
+    return series.astype(str).str.contains(term, case=False, regex=False, na=False).to_numpy()
+
+
+def query_table(df, search=None, sort_by=None, ascending=True):
+    """
+    Posisi baris df setelah pencarian per kolom (dict kolom -> teks) dan sort.
+    Hanya posisi yang dikembalikan; halaman diambil dengan table_page.
+    """
+    mask = np.ones(len(df), dtype=bool)
+    for col, term in (search or {}).items():
+        if term:
+            mask &= search_mask(df[col], term)
+    positions = np.flatnonzero(mask)
+
+    if sort_by is not None and len(positions):
+        values = df[sort_by].iloc[positions]
+        order = values.reset_index(drop=True).sort_values(
+            ascending=ascending, kind='mergesort', na_position='last').index.to_numpy()
+        positions = positions[order]
+    return positions
+
+
+def table_page(df, positions, page, page_size):
+    """
+    Baris untuk halaman ke-page (mulai dari 1)
+    """
+    start = (page - 1) * page_size
+    return df.iloc[positions[start:start + page_size]]
+
+
+def iter_csv_chunks(df, chunk_rows=EXPORT_CHUNK_ROWS):
+    """
+    CSV df sebagai potongan bytes (header hanya di potongan pertama)
+    """
+    for start in range(0, max(len(df), 1), chunk_rows):
+        buffer = io.StringIO()
+        df.iloc[start:start + chunk_rows].to_csv(buffer, index=False, header=(start == 0))
+        yield buffer.getvalue().encode('utf-8')
+
+
+def paged_table(df, key, columns=None, memo_key=None, file_name="export.csv"):
+    """
+    Tabel dengan sort, pencarian per kolom dan halaman yang dihitung di server;
+    hanya halaman yang terlihat dikirim ke browser. Export CSV seluruh hasil
+    (semua halaman) dibuat terpisah, hanya kalau diminta.
+
+    memo_key (mis. state filter) dipakai untuk memo posisi hasil sort/pencarian
+    sehingga pindah halaman tidak mengurutkan ulang.
+    """
+    columns = list(columns or df.columns)
+    df = df[columns]
+
+    controls = st.columns([2, 1, 1, 1])
+    sort_by = controls[0].selectbox("Urutkan berdasarkan", ["(tanpa urutan)"] + columns,
+                                    key=f"{key}_sort_by")
+    sort_by = None if sort_by == "(tanpa urutan)" else sort_by
+    ascending = controls[1].radio("Arah", ["Naik", "Turun"], key=f"{key}_order",
+                                  horizontal=True) == "Naik"
+    page_size = controls[2].selectbox("Baris per halaman", PAGE_SIZES, key=f"{key}_page_size")
+
+    with st.expander("🔎 Cari per kolom"):
+        search_cols = st.columns(len(columns))
+        search = {
+            col: search_cols[i].text_input(col, key=f"{key}_search_{col}").strip()
+            for i, col in enumerate(columns)
+        }
+
+    view_key = (key, memo_key, tuple(sorted(search.items())), sort_by, ascending)
+    if memo_key is not None:
+        positions = get_memo('table_views', maxsize=64).get_or_compute(
+            view_key, lambda: query_table(df, search, sort_by, ascending))
+    else:
+        positions = query_table(df, search, sort_by, ascending)
+
+    n_pages = max(1, -(-len(positions) // page_size))
+    page_key = f"{key}_page"
+    # Halaman lama bisa melewati jumlah halaman setelah filter/pencarian berubah
+    if st.session_state.get(page_key, 1) > n_pages:
+        st.session_state[page_key] = n_pages
+    page = controls[3].number_input("Halaman", min_value=1, max_value=n_pages, step=1, key=page_key)
+
+    start = (page - 1) * page_size
+    st.dataframe(table_page(df, positions, page, page_size))
+    st.caption(f"Baris {min(start + 1, len(positions))}–{min(start + page_size, len(positions))} "
+               f"dari {len(positions)} · halaman {page} dari {n_pages}")
+
+    if st.button("Siapkan export CSV", key=f"{key}_export"):
+        export = io.BytesIO()
+        for chunk in iter_csv_chunks(df.iloc[positions]):
+            export.write(chunk)
+        st.download_button("⬇️ Download CSV", export.getvalue(), file_name=file_name,
+                           mime="text/csv", key=f"{key}_download")
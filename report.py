@@ -0,0 +1,88 @@
+"""
+Report batch dari snapshot lokal tanpa Streamlit, mis. untuk dijalankan malam hari:
+
+    python report.py 2024-01-01:2024-01-31 2024-02-01:2024-02-29 -o report.json
+
+Snapshot dibaca sekali; cube harian dan tabel narasumber dibangun sekali lalu
+dipakai untuk semua rentang. Hanya pandas/pyarrow yang di-import (tanpa
+streamlit, plotly atau gspread) supaya start-up cepat.
+"""
+import argparse
+import json
+import sys
+from datetime import date
+
+import pandas as pd
+
+from analytics import DEFAULT_WINDOW_DAYS, build_daily_cube, build_narasumber_table, build_report
+from schema import SHEET_SCHEMAS, normalize_frame
+from snapshot_store import read_snapshot
+
+SHEETS = ('DATASET SP', 'DATASET BERITA')
+
+# Sama seperti dashboard: frame hasil normalisasi tidak pernah diubah in-place
+pd.set_option("mode.copy_on_write", True)
+
+
+def parse_range(text):
+    """
+    "YYYY-MM-DD:YYYY-MM-DD" -> (date awal, date akhir)
+    """
+    try:
+        start, end = text.split(':')
+        return date.fromisoformat(start), date.fromisoformat(end)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Rentang tidak valid: {text!r} (format YYYY-MM-DD:YYYY-MM-DD)")
+
+
+def load_snapshots(directory=None):
+    """
+    Baca dan normalisasi snapshot kedua sheet; error kalau ada yang tidak tersedia
+    """
+    frames = {}
+    for sheet in SHEETS:
+        df, _ = read_snapshot(sheet, directory)
+        if df is None:
+            raise SystemExit(f"Snapshot {sheet} tidak ditemukan atau rusak")
+        frames[sheet], _ = normalize_frame(df, SHEET_SCHEMAS[sheet])
+    return frames
+
+
+def run(ranges, directory=None, window_days=DEFAULT_WINDOW_DAYS):
+    """
+    Report (dict JSON-friendly) untuk setiap rentang tanggal
+    """
+    frames = load_snapshots(directory)
+    sp_df = frames['DATASET SP']
+    berita_df = frames['DATASET BERITA']
+    cube = build_daily_cube(berita_df)
+    narasumber_table = build_narasumber_table(sp_df)
+    return [
+        build_report(sp_df, berita_df, start, end, window_days=window_days,
+                     cube=cube, narasumber_table=narasumber_table).to_dict()
+        for start, end in ranges
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report monitoring siaran pers dari snapshot lokal")
+    parser.add_argument("ranges", nargs="+", type=parse_range, metavar="AWAL:AKHIR",
+                        help="rentang tanggal PUBLIKASI, mis. 2024-01-01:2024-01-31")
+    parser.add_argument("--snapshot-dir", default=None,
+                        help="folder snapshot (default DATASET_SNAPSHOT_DIR atau .snapshots)")
+    parser.add_argument("--window-days", type=int, default=DEFAULT_WINDOW_DAYS,
+                        help="jendela pemberitaan setelah siaran pers (hari)")
+    parser.add_argument("-o", "--output", default=None, help="file JSON hasil (default stdout)")
+    args = parser.parse_args(argv)
+
+    reports = run(args.ranges, args.snapshot_dir, args.window_days)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(reports, f, indent=2, ensure_ascii=False)
+    else:
+        json.dump(reports, sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
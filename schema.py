@@ -0,0 +1,61 @@
+import pandas as pd
+
+# Tipe kolom per sheet:
+# - datetime: diparse sekali saat load (gagal parse -> NaT dan dilaporkan)
+# - category: kolom dengan banyak nilai berulang, disimpan sebagai categorical
+# - text: string berbasis Arrow (string[pyarrow]), sama dengan tipe di snapshot
+#   hasil normalisasi sehingga frame dari Google Sheets dan dari snapshot identik
+SHEET_SCHEMAS = {
+    'DATASET SP': {
+        'JUDUL': 'category',
+        'PUBLIKASI': 'datetime',
+        'NARASUMBER': 'text',
+    },
+    'DATASET BERITA': {
+        'Judul Berita': 'text',
+        'Tanggal': 'datetime',
+        'Sumber Media': 'category',
+        'Siaran Pers': 'category',
+        'Link Berita': 'text',
+    },
+}
+
+PARSE_ERROR_COLUMNS = ['Baris', 'Kolom', 'Nilai']
+
+# Tipe kolom text setelah normalisasi
+TEXT_DTYPE = pd.StringDtype('pyarrow')
+
+
+def normalize_frame(df, schema):
+    """
+    Konversi kolom string mentah dari Google Sheets ke tipe yang dideklarasikan
+    di schema. DataFrame asli tidak diubah.
+
+    Mengembalikan (DataFrame hasil, DataFrame baris yang gagal diparse dengan
+    nomor baris sheet, nama kolom dan nilai aslinya).
+    """
+    converted = {}
+    errors = []
+    for col, kind in schema.items():
+        if col not in df.columns:
+            continue
+        raw = df[col]
+        if kind == 'datetime':
+            parsed = pd.to_datetime(raw, errors='coerce')
+            failed = parsed.isna() & raw.notna() & (raw.astype(str).str.strip() != '')
+            if failed.any():
+                errors.append(pd.DataFrame({
+                    # Nomor baris di sheet: header di baris 1, data mulai baris 2
+                    'Baris': df.index[failed.to_numpy()] + 2,
+                    'Kolom': col,
+                    'Nilai': raw[failed].to_numpy(),
+                }))
+            converted[col] = parsed
+        elif kind == 'category':
+            converted[col] = raw.astype('category')
+        elif kind == 'text':
+            converted[col] = raw.astype(TEXT_DTYPE)
+
+    parse_errors = (pd.concat(errors, ignore_index=True) if errors
+                    else pd.DataFrame(columns=PARSE_ERROR_COLUMNS))
+    return df.assign(**converted), parse_errors
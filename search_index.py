@@ -0,0 +1,148 @@
+import re
+import unicodedata
+from bisect import bisect_left
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Kata umum bahasa Indonesia yang tidak diindeks
+STOPWORDS = frozenset("""
+ada adalah agar akan antara atas atau bagi bahwa baru belum beberapa begitu bisa
+dalam dan dari dengan di dia ia ini itu jadi jika juga kami kata ke kepada kita
+lagi lain lalu maka masih mereka nya oleh pada para saat sama sampai saja sangat
+sebagai sebuah secara sedang sejak selama semua sendiri serta setelah seperti
+sudah supaya tak tanpa telah tentang terhadap tersebut tetapi tidak untuk yaitu
+yakni yang
+""".split())
+
+# Partikel/klitik yang ditempel di akhir kata: "kebijakannya" -> "kebijakan"
+CLITICS = ('nya', 'lah', 'kah', 'pun')
+
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+
+
+def normalize_text(text):
+    """
+    Huruf kecil (casefold), tanpa diakritik, selain huruf/angka jadi spasi
+    """
+    text = str(text).casefold()
+    if not text.isascii():
+        text = unicodedata.normalize('NFKD', text)
+        text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return _NON_ALNUM.sub(' ', text)
+
+
+def strip_clitic(token):
+    for clitic in CLITICS:
+        # Kata pendek seperti "pun" atau "kalah" tidak dipotong
+        if token.endswith(clitic) and len(token) - len(clitic) >= 3:
+            return token[:-len(clitic)]
+    return token
+
+
+@lru_cache(maxsize=65536)
+def _word_token(word):
+    # Kata yang sama sangat sering berulang antar judul; hasilnya di-cache
+    token = strip_clitic(word)
+    return None if token in STOPWORDS else token
+
+
+def tokenize(text):
+    """
+    Token pencarian dari teks: dinormalisasi, klitik dibuang, tanpa stopword
+    """
+    tokens = []
+    for word in normalize_text(text).split():
+        token = _word_token(word)
+        if token:
+            tokens.append(token)
+    return tokens
+
+
+def query_words(text):
+    """
+    Kata query apa adanya (dinormalisasi, tanpa stopword, klitik TIDAK
+    dibuang): kata terakhir bisa saja masih diketik, mis. "sekol"
+    """
+    return [word for word in normalize_text(text).split() if _word_token(word)]
+
+
+class TokenIndex:
+    """
+    Inverted index kata -> posisi baris untuk satu kolom teks. Teks yang
+    sama (mis. kategori JUDUL) hanya ditokenisasi sekali. Setiap kata
+    diindeks dalam bentuk aslinya (kosakata urut, untuk pencarian prefix
+    dengan bisect) dan bentuk tanpa klitik (hanya cocok persis).
+    """
+
+    def __init__(self, values):
+        codes, uniques = pd.factorize(pd.Series(values).astype(object), use_na_sentinel=True)
+        self.n_rows = len(codes)
+
+        # Posisi baris dikelompokkan per nilai unik (urut naik di dalam kelompok)
+        order = np.argsort(codes, kind='stable')
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        self._rows = order[np.count_nonzero(codes < 0):]
+        self._starts = np.concatenate([[0], np.cumsum(counts)])
+
+        postings = {}
+        stems = {}
+        for value_id, text in enumerate(uniques):
+            words = set(normalize_text(text).split())
+            for word in words:
+                # _word_token: kata tanpa klitik, None untuk stopword
+                stem = _word_token(word)
+                if stem:
+                    postings.setdefault(word, []).append(value_id)
+                    if stem != word:
+                        stems.setdefault(stem, []).append(value_id)
+        self.vocabulary = sorted(postings)
+        self._postings = {word: np.array(ids, dtype=np.intp) for word, ids in postings.items()}
+        self._stems = {stem: np.array(ids, dtype=np.intp) for stem, ids in stems.items()}
+
+    def _value_ids(self, word, prefix=True, stem=True):
+        # Bentuk asli: awalan kata (atau persis); bentuk tanpa klitik: persis,
+        # mis. "kebijakannya" juga menemukan "kebijakan"
+        matched = []
+        if stem:
+            stem = strip_clitic(word)
+            matched.append(self._postings.get(stem, np.empty(0, dtype=np.intp)))
+            matched.append(self._stems.get(stem, np.empty(0, dtype=np.intp)))
+        if not prefix:
+            matched.append(self._postings.get(word, np.empty(0, dtype=np.intp)))
+        else:
+            i = bisect_left(self.vocabulary, word)
+            while i < len(self.vocabulary) and self.vocabulary[i].startswith(word):
+                matched.append(self._postings[self.vocabulary[i]])
+                i += 1
+        if not matched:
+            return np.empty(0, dtype=np.intp)
+        return np.unique(np.concatenate(matched))
+
+    def search(self, query, prefix=True):
+        """
+        Posisi baris (urut naik) yang memuat SEMUA kata query; setiap kata
+        query cocok sebagai awalan kata. Klitik hanya dibuang dari kata yang
+        sudah selesai diketik (bukan kata terakhir), karena awalan seperti
+        "sekolah" -> "seko" akan salah cocok. Query tanpa kata mengembalikan
+        None (tidak ada filter).
+        """
+        words = query_words(query)
+        if not words:
+            return None
+        value_ids = None
+        for i, word in enumerate(words):
+            ids = self._value_ids(word, prefix, stem=i < len(words) - 1)
+            value_ids = ids if value_ids is None else np.intersect1d(value_ids, ids, assume_unique=True)
+            if not len(value_ids):
+                return np.empty(0, dtype=np.intp)
+        rows = [self._rows[self._starts[i]:self._starts[i + 1]] for i in value_ids]
+        return np.sort(np.concatenate(rows))
+
+
+def query_key(query):
+    """
+    Bentuk kanonik query (tuple kata) untuk key memo/filter state
+    """
+    return tuple(query_words(query or ''))
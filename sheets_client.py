@@ -0,0 +1,143 @@
+import threading
+
+import gspread
+from google.auth.transport.requests import AuthorizedSession
+from google.oauth2.service_account import Credentials
+from requests.adapters import HTTPAdapter
+
+SCOPES = [
+    'https://spreadsheets.google.com/feeds',
+    'https://www.googleapis.com/auth/drive'
+]
+
+# Host API Google yang dipakai gspread (Sheets v4 dan Drive v3)
+GOOGLE_API_HOSTS = (
+    "https://sheets.googleapis.com",
+    "https://www.googleapis.com",
+)
+
+# Jumlah koneksi keep-alive per host yang boleh dipakai bersamaan oleh thread
+DEFAULT_POOL_SIZE = 10
+
+
+class _BaseUrlAdapter(HTTPAdapter):
+    """
+    HTTPAdapter yang mengarahkan request ke host API Google ke base URL lain,
+    misalnya server HTTP lokal pengganti Google Sheets saat testing
+    """
+
+    def __init__(self, base_url, **kwargs):
+        super().__init__(**kwargs)
+        self.base_url = base_url.rstrip("/")
+
+    def send(self, request, **kwargs):
+        for host in GOOGLE_API_HOSTS:
+            if request.url.startswith(host):
+                request.url = self.base_url + request.url[len(host):]
+                break
+        return super().send(request, **kwargs)
+
+
+class SheetsClientManager:
+    """
+    Client Google Sheets yang dibuat sekali per proses.
+
+    Kredensial, client gspread, handle Spreadsheet dan handle Worksheet
+    disimpan dan dipakai ulang. Token hanya di-refresh oleh AuthorizedSession
+    ketika sudah kadaluarsa, dan koneksi HTTP (keep-alive) dipakai bersama
+    oleh semua session dan thread.
+
+    `timeout` (detik) adalah batas waktu setiap request HTTP gspread; tanpa
+    batas ini request yang macet menahan thread pemanggilnya selamanya.
+
+    Untuk testing: berikan `credentials` (mis. AnonymousCredentials) dan
+    `api_base_url` yang menunjuk ke server HTTP lokal.
+    """
+
+    def __init__(self, spreadsheet_id, credentials_info=None, credentials=None,
+                 api_base_url=None, pool_size=DEFAULT_POOL_SIZE, timeout=None):
+        if credentials is None and credentials_info is None:
+            raise ValueError("credentials_info atau credentials harus diisi")
+        self.spreadsheet_id = spreadsheet_id
+        self._credentials_info = credentials_info
+        self._credentials = credentials
+        self._api_base_url = api_base_url
+        self._pool_size = pool_size
+        self.timeout = timeout
+        self._lock = threading.RLock()
+        self._session = None
+        self._client = None
+        self._spreadsheet = None
+        self._worksheets = {}
+
+    def _build_session(self):
+        if self._credentials is None:
+            self._credentials = Credentials.from_service_account_info(
+                dict(self._credentials_info), scopes=SCOPES)
+
+        session = AuthorizedSession(self._credentials)
+        if self._api_base_url:
+            adapter = _BaseUrlAdapter(
+                self._api_base_url,
+                pool_connections=len(GOOGLE_API_HOSTS),
+                pool_maxsize=self._pool_size)
+            for host in GOOGLE_API_HOSTS:
+                session.mount(host, adapter)
+        else:
+            adapter = HTTPAdapter(
+                pool_connections=len(GOOGLE_API_HOSTS),
+                pool_maxsize=self._pool_size)
+            session.mount("https://", adapter)
+        return session
+
+    @property
+    def session(self):
+        with self._lock:
+            if self._session is None:
+                self._session = self._build_session()
+            return self._session
+
+    def client(self):
+        """
+        Client gspread yang sudah terotorisasi (dibuat sekali)
+        """
+        with self._lock:
+            if self._client is None:
+                # Session dibuat dulu karena sekaligus membangun kredensial
+                session = self.session
+                self._client = gspread.Client(auth=self._credentials, session=session)
+                self._client.set_timeout(self.timeout)
+            return self._client
+
+    def spreadsheet(self):
+        """
+        Handle Spreadsheet (dibuka sekali per proses)
+        """
+        with self._lock:
+            if self._spreadsheet is None:
+                self._spreadsheet = self.client().open_by_key(self.spreadsheet_id)
+            return self._spreadsheet
+
+    def worksheet(self, sheet_name):
+        """
+        Handle Worksheet per nama sheet, disimpan supaya tidak perlu
+        mengambil metadata spreadsheet di setiap load
+        """
+        with self._lock:
+            worksheet = self._worksheets.get(sheet_name)
+            if worksheet is None:
+                worksheet = self.spreadsheet().worksheet(sheet_name)
+                self._worksheets[sheet_name] = worksheet
+            return worksheet
+
+    def reset(self):
+        """
+        Buang semua handle (mis. setelah kredensial diganti atau sheet di-rename)
+        """
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+            self._session = None
+            self._client = None
+            self._spreadsheet = None
+            self._worksheets = {}
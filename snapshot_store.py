@@ -0,0 +1,198 @@
+import hashlib
+import json
+import os
+import re
+import time
+
+import pandas as pd
+import pyarrow as pa
+
+# Folder snapshot lokal (Arrow IPC + metadata JSON per sheet)
+SNAPSHOT_DIR = os.environ.get("DATASET_SNAPSHOT_DIR", ".snapshots")
+
+
+def _slug(name):
+    return re.sub(r'[^0-9a-zA-Z]+', '_', name).strip('_').lower()
+
+
+def snapshot_path(name, directory=None):
+    """
+    Path file Arrow IPC untuk snapshot sebuah sheet
+    """
+    return os.path.join(directory or SNAPSHOT_DIR, f"{_slug(name)}.arrow")
+
+
+def normalized_snapshot_path(name, directory=None):
+    """
+    Path file Arrow IPC untuk snapshot frame hasil normalisasi sebuah sheet
+    """
+    return os.path.join(directory or SNAPSHOT_DIR, f"{_slug(name)}.normalized.arrow")
+
+
+def _meta_path(name, directory=None):
+    return os.path.join(directory or SNAPSHOT_DIR, f"{_slug(name)}.json")
+
+
+def frame_checksum(df):
+    """
+    Checksum isi DataFrame (nilai + nama kolom), tidak tergantung index
+    """
+    digest = hashlib.sha1()
+    digest.update(json.dumps(list(map(str, df.columns))).encode())
+    if len(df):
+        digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+def _atomic_write(path, write):
+    tmp_path = f"{path}.tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _write_table(path, table):
+    with pa.OSFile(path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def write_snapshot(name, df, meta=None, directory=None, checksum=None):
+    """
+    Simpan DataFrame sebagai snapshot Arrow IPC beserta metadata-nya.
+    File ditulis ke file sementara lalu di-rename supaya pembaca tidak pernah
+    melihat file setengah jadi. checksum (hasil frame_checksum) bisa
+    diberikan kalau pemanggil sudah menghitungnya.
+    """
+    os.makedirs(directory or SNAPSHOT_DIR, exist_ok=True)
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    meta = dict(meta or {})
+    meta.update({
+        "rows": len(df),
+        "columns": list(map(str, df.columns)),
+        "checksum": checksum or frame_checksum(df),
+        "written_at": time.time(),
+    })
+
+    def write_meta(path):
+        with open(path, 'w') as f:
+            json.dump(meta, f)
+
+    _atomic_write(snapshot_path(name, directory), lambda path: _write_table(path, table))
+    _atomic_write(_meta_path(name, directory), write_meta)
+    return meta
+
+
+def read_snapshot_meta(name, directory=None):
+    """
+    Metadata snapshot sebuah sheet, atau None kalau belum ada
+    """
+    try:
+        with open(_meta_path(name, directory)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def update_snapshot_meta(name, updates, directory=None):
+    """
+    Perbarui sebagian metadata snapshot tanpa menulis ulang datanya
+    """
+    meta = read_snapshot_meta(name, directory) or {}
+    meta.update(updates)
+
+    def write_meta(path):
+        with open(path, 'w') as f:
+            json.dump(meta, f)
+
+    _atomic_write(_meta_path(name, directory), write_meta)
+    return meta
+
+
+def read_snapshot(name, directory=None, verify=False):
+    """
+    Baca snapshot sebuah sheet. Mengembalikan (DataFrame, metadata) atau
+    (None, None) kalau snapshot belum ada, rusak, atau tidak cocok dengan
+    metadata-nya (jumlah baris/kolom).
+
+    Checksum dihitung saat menulis; saat membaca metadata dipercaya supaya
+    cold start tidak meng-hash seluruh frame. verify=True menghitung ulang
+    checksum isi dan menolak snapshot yang tidak cocok.
+    """
+    path = snapshot_path(name, directory)
+    if not os.path.exists(path):
+        return None, None
+    try:
+        with open(_meta_path(name, directory)) as f:
+            meta = json.load(f)
+        with pa.memory_map(path, 'r') as source:
+            df = pa.ipc.open_file(source).read_all().to_pandas()
+    except (OSError, ValueError, pa.ArrowException):
+        return None, None
+
+    if len(df) != meta.get("rows") or list(map(str, df.columns)) != meta.get("columns"):
+        return None, None
+    if verify and frame_checksum(df) != meta.get("checksum"):
+        return None, None
+    return df, meta
+
+
+def write_normalized_snapshot(name, df, source_checksum, extra=None, directory=None):
+    """
+    Simpan frame hasil normalisasi dengan tipe kolomnya (timestamp,
+    dictionary untuk categorical, string Arrow, index) supaya cold start
+    tidak perlu membaca nilai mentah dan menormalisasi ulang. source_checksum
+    adalah checksum snapshot mentah asalnya; extra (dict JSON) ikut disimpan.
+    """
+    os.makedirs(directory or SNAPSHOT_DIR, exist_ok=True)
+    table = pa.Table.from_pandas(df, preserve_index=True)
+    table = table.replace_schema_metadata({
+        **table.schema.metadata,
+        b"source_checksum": source_checksum.encode(),
+        b"extra": json.dumps(extra or {}).encode(),
+    })
+    _atomic_write(normalized_snapshot_path(name, directory), lambda path: _write_table(path, table))
+
+
+def normalized_snapshot_source(name, directory=None):
+    """
+    source_checksum snapshot hasil normalisasi (hanya schema yang dibaca),
+    atau None kalau belum ada
+    """
+    try:
+        with pa.memory_map(normalized_snapshot_path(name, directory), 'r') as source:
+            metadata = pa.ipc.open_file(source).schema.metadata or {}
+    except (OSError, pa.ArrowException):
+        return None
+    return metadata.get(b"source_checksum", b"").decode() or None
+
+
+def read_normalized_snapshot(name, source_checksum, directory=None):
+    """
+    Baca snapshot hasil normalisasi (memory-mapped; kolom timestamp,
+    dictionary dan string Arrow tidak diubah menjadi objek Python).
+    Mengembalikan (DataFrame, extra) atau (None, None) kalau belum ada, rusak,
+    atau berasal dari snapshot mentah dengan checksum lain.
+    """
+    path = normalized_snapshot_path(name, directory)
+    if not os.path.exists(path):
+        return None, None
+    try:
+        with pa.memory_map(path, 'r') as source:
+            table = pa.ipc.open_file(source).read_all()
+            metadata = table.schema.metadata or {}
+            if metadata.get(b"source_checksum", b"").decode() != source_checksum:
+                return None, None
+            df = table.to_pandas(types_mapper=_arrow_types)
+            extra = json.loads(metadata.get(b"extra", b"{}"))
+    except (OSError, ValueError, pa.ArrowException):
+        return None, None
+    return df, extra
+
+
+def _arrow_types(arrow_type):
+    # Kolom string tetap berbasis Arrow (tanpa membuat objek str per sel)
+    if arrow_type in (pa.string(), pa.large_string()):
+        return pd.StringDtype('pyarrow')
+    return None
@@ -0,0 +1,190 @@
+import numpy as np
+import pandas as pd
+
+from analytics import DEFAULT_WINDOW_DAYS
+from search_index import normalize_text
+
+# Skor minimum (Dice trigram) supaya sebuah siaran pers diusulkan sama sekali
+MIN_CANDIDATE_SCORE = 0.5
+
+# Skor minimum supaya usulan dipakai otomatis saat pencocokan fuzzy diaktifkan
+ACCEPT_SCORE = 0.8
+
+# Jumlah hit (posting) per blok saat mencari banyak judul sekaligus
+SEARCH_CHUNK = 2000000
+
+
+def title_trigrams(text):
+    """
+    Himpunan trigram karakter dari judul yang sudah dinormalisasi (spasi di
+    awal/akhir ikut supaya awal dan akhir kata punya bobot)
+    """
+    text = f" {' '.join(normalize_text(text).split())} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """
+    Index trigram -> baris judul. Postings setiap trigram urut menurut posisi
+    baris, jadi kalau baris sudah diurutkan (mis. per tanggal publikasi)
+    pencarian bisa dibatasi ke rentang baris [start, stop) dengan
+    searchsorted tanpa menyentuh baris di luar rentang. Skor yang dihitung
+    adalah koefisien Dice antar himpunan trigram.
+    """
+
+    def __init__(self, titles):
+        codes, uniques = pd.factorize(pd.Series(titles, dtype=object))
+        self.n_rows = len(codes)
+
+        # Trigram dihitung sekali per judul unik lalu diperluas ke setiap baris
+        unique_grams = [sorted(title_trigrams(title)) for title in uniques]
+        unique_sizes = np.array([len(grams) for grams in unique_grams], dtype=np.intp)
+        gram_codes, gram_uniques = pd.factorize(
+            np.array([gram for grams in unique_grams for gram in grams], dtype=object))
+        self._grams = pd.Index(gram_uniques)
+
+        rows = np.flatnonzero(codes >= 0)
+        sizes = unique_sizes[codes[rows]]
+        self.sizes = np.zeros(self.n_rows)
+        self.sizes[rows] = sizes
+        unique_starts = np.concatenate([[0], np.cumsum(unique_sizes)[:-1]])
+        row_starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        within = np.arange(sizes.sum()) - np.repeat(row_starts, sizes)
+        row_grams = gram_codes[np.repeat(unique_starts[codes[rows]], sizes) + within]
+
+        # Key postings: trigram * n_rows + baris, diurutkan sekali
+        self._keys = np.sort(row_grams.astype(np.int64) * self.n_rows + np.repeat(rows, sizes))
+
+    def search(self, texts, starts, stops):
+        """
+        Skor Dice setiap teks terhadap baris index di rentang [starts[i],
+        stops[i]) masing-masing, hanya untuk baris yang berbagi minimal satu
+        trigram. Mengembalikan (posisi teks, baris, skor).
+
+        Hit dihitung sparse (np.unique per blok teks), jadi biayanya sebanding
+        dengan jumlah posting di rentang, bukan teks x jumlah baris index.
+        """
+        gram_sets = [title_trigrams(text) for text in texts]
+        query_sizes = np.array([len(grams) for grams in gram_sets], dtype=np.intp)
+        gram_ids = self._grams.get_indexer(
+            np.array([gram for grams in gram_sets for gram in grams], dtype=object)).astype(np.int64)
+        queries = np.repeat(np.arange(len(texts)), query_sizes)
+        known = gram_ids >= 0
+        gram_ids, queries = gram_ids[known], queries[known]
+
+        # Posting satu trigram di rentang baris = satu potongan _keys
+        lo = np.searchsorted(self._keys, gram_ids * self.n_rows + np.asarray(starts)[queries])
+        hi = np.searchsorted(self._keys, gram_ids * self.n_rows + np.asarray(stops)[queries])
+        lengths = np.maximum(hi - lo, 0)
+
+        found = [(np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp), np.empty(0))]
+        # Teks diproses per blok supaya array hit tetap kecil
+        ends = np.cumsum(lengths)
+        begin = 0
+        while begin < len(lengths):
+            end = max(begin + 1, np.searchsorted(ends, ends[begin] - lengths[begin] + SEARCH_CHUNK, side='right'))
+            # Potongan tidak boleh memisahkan trigram dari teks yang sama
+            end = np.searchsorted(queries, queries[end - 1], side='right') if end < len(lengths) else end
+            block = slice(begin, end)
+            total = lengths[block].sum()
+            offsets = np.cumsum(lengths[block]) - lengths[block]
+            hits = self._keys[np.repeat(lo[block] - offsets, lengths[block]) + np.arange(total)] % self.n_rows
+            pair_keys, counts = np.unique(np.repeat(queries[block], lengths[block]) * self.n_rows + hits,
+                                          return_counts=True)
+            query, rows = pair_keys // self.n_rows, pair_keys % self.n_rows
+            found.append((query, rows, 2 * counts / (query_sizes[query] + self.sizes[rows])))
+            begin = end
+        return tuple(np.concatenate(parts) for parts in zip(*found))
+
+
+def _empty_matches():
+    return pd.DataFrame({
+        'berita_pos': np.empty(0, dtype=np.intp),
+        'Siaran Pers': pd.Series(dtype=object),
+        'sp_pos': np.empty(0, dtype=np.intp),
+        'Usulan SP': pd.Series(dtype=object),
+        'Skor': np.empty(0),
+    })
+
+
+def fuzzy_match_titles(berita_df, sp_df, window_days=DEFAULT_WINDOW_DAYS, min_score=MIN_CANDIDATE_SCORE):
+    """
+    Usulan siaran pers untuk berita yang kolom 'Siaran Pers'-nya tidak persis
+    sama dengan JUDUL mana pun (salah ketik, judul terpotong).
+
+    Baris siaran pers diindeks per trigram dalam urutan PUBLIKASI. Setiap
+    judul berita unik dicari sekali, hanya di siaran pers yang jendelanya
+    (PUBLIKASI <= Tanggal <= PUBLIKASI + window_days) bisa mencakup tanggal
+    berita-berita dengan judul itu. Kandidat dengan skor >= min_score lalu
+    disaring jendela per berita sebelum memilih yang terbaik.
+
+    Mengembalikan satu baris per berita tersebut: berita_pos, Siaran Pers
+    (judul asli), sp_pos (-1 kalau tidak ada kandidat), Usulan SP dan Skor
+    (0..1, 0 kalau tidak ada kandidat).
+    """
+    sp_titles = sp_df['JUDUL'].astype(object)
+    berita_titles = berita_df['Siaran Pers'].astype(object)
+    unknown = (berita_titles.notna() & berita_df['Tanggal'].notna()
+               & ~berita_titles.isin(set(sp_titles.dropna()))).to_numpy()
+    if not unknown.any():
+        return _empty_matches()
+
+    # Siaran pers valid diurutkan per PUBLIKASI: rentang tanggal = rentang baris index
+    sp_positions = np.flatnonzero((sp_titles.notna() & sp_df['PUBLIKASI'].notna()).to_numpy())
+    publikasi = sp_df['PUBLIKASI'].to_numpy()[sp_positions]
+    order = np.argsort(publikasi, kind='stable')
+    sp_positions, publikasi = sp_positions[order], publikasi[order]
+    index = TrigramIndex(sp_titles.to_numpy()[sp_positions])
+
+    berita_codes, berita_uniques = pd.factorize(berita_titles[unknown])
+    tanggal = berita_df['Tanggal'].to_numpy()[unknown]
+    window = np.timedelta64(window_days, 'D')
+    first_date = pd.Series(tanggal).groupby(berita_codes).min().to_numpy()
+    last_date = pd.Series(tanggal).groupby(berita_codes).max().to_numpy()
+    starts = np.searchsorted(publikasi, first_date - window, side='left')
+    stops = np.searchsorted(publikasi, last_date, side='right')
+
+    title_ids, sp_rows, scores = index.search(berita_uniques, starts, stops)
+    keep = scores >= min_score
+    title_ids, sp_rows, scores = title_ids[keep], sp_rows[keep], scores[keep]
+
+    articles = pd.DataFrame({
+        'berita_pos': np.flatnonzero(unknown),
+        'title_id': berita_codes,
+        'tanggal': tanggal,
+    })
+    candidates = pd.DataFrame({
+        'title_id': title_ids,
+        'sp_pos': sp_positions[sp_rows],
+        'publikasi': publikasi[sp_rows],
+        'score': scores,
+    })
+
+    pairs = articles.merge(candidates, on='title_id')
+    delta = pairs['tanggal'] - pairs['publikasi']
+    pairs = pairs.assign(delta=delta)[(delta >= pd.Timedelta(0)) & (delta <= pd.Timedelta(days=window_days))]
+    # Per berita: skor tertinggi, lalu siaran pers yang paling dekat tanggalnya
+    best = (pairs.sort_values(['berita_pos', 'score', 'delta'], ascending=[True, False, True], kind='mergesort')
+            .drop_duplicates('berita_pos')
+            .set_index('berita_pos'))
+
+    best = best.reindex(articles['berita_pos'])
+    sp_pos = best['sp_pos'].fillna(-1).astype(np.intp).to_numpy()
+    return pd.DataFrame({
+        'berita_pos': articles['berita_pos'].to_numpy(),
+        'Siaran Pers': berita_uniques[berita_codes],
+        'sp_pos': sp_pos,
+        'Usulan SP': np.where(sp_pos >= 0, sp_titles.to_numpy()[sp_pos], None),
+        'Skor': best['score'].fillna(0.0).to_numpy(),
+    })
+
+
+def apply_fuzzy_titles(berita_df, matches, accept_score=ACCEPT_SCORE):
+    """
+    Frame berita dengan 'Siaran Pers' diganti judul usulan untuk baris yang
+    skornya >= accept_score. Frame asli tidak diubah.
+    """
+    accepted = matches[matches['Skor'] >= accept_score]
+    titles = berita_df['Siaran Pers'].astype(object).to_numpy(copy=True)
+    titles[accepted['berita_pos'].to_numpy()] = accepted['Usulan SP'].to_numpy()
+    return berita_df.assign(**{'Siaran Pers': pd.Categorical(titles)})